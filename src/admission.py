@@ -0,0 +1,177 @@
+"""Admission control and rate limiting for credit pulls.
+
+``AdmissionQueue`` bounds how many credit pulls run at once and how many may
+wait for a slot. A pull that finds the queue full, or that waits longer than
+``EXPERIAN_QUEUE_TIMEOUT`` or past its request's deadline, fails immediately
+with ``OverloadedError`` instead of adding to a backlog whose latency would
+grow without bound.
+
+``RateLimiter`` is a token bucket that paces the requests sent to Experian so
+bursts stay within the bureau quota rather than being answered with 429s.
+
+Settings are read from the environment:
+
+    EXPERIAN_MAX_CONCURRENT_PULLS  credit pulls in flight at once (default 32)
+    EXPERIAN_ADMISSION_QUEUE       pulls that may wait for a slot; more are rejected (default 256)
+    EXPERIAN_QUEUE_TIMEOUT         seconds a pull may wait for a slot (default 10)
+    EXPERIAN_RATE_LIMIT            credit report requests per second; 0 is unlimited (default 0)
+    EXPERIAN_RATE_BURST            requests that may be sent at once (default: one second's worth)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import metrics
+
+MAX_CONCURRENT_PULLS = max(1, int(os.getenv("EXPERIAN_MAX_CONCURRENT_PULLS", "32")))
+ADMISSION_QUEUE = max(0, int(os.getenv("EXPERIAN_ADMISSION_QUEUE", "256")))
+QUEUE_TIMEOUT = float(os.getenv("EXPERIAN_QUEUE_TIMEOUT", "10"))
+RATE_LIMIT = float(os.getenv("EXPERIAN_RATE_LIMIT", "0"))
+RATE_BURST = float(os.getenv("EXPERIAN_RATE_BURST", "0")) or max(RATE_LIMIT, 1.0)
+
+
+class OverloadedError(Exception):
+    """Raised when a request is not admitted because the server is at capacity."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionQueue:
+    """Runs at most ``max_active`` operations at once with at most ``max_queued`` waiting.
+
+    Waiters are admitted first come, first served.
+
+    Args:
+        name (str): Name of the guarded operation, used in errors and metrics.
+        max_active (int): Operations allowed to run at once.
+        max_queued (int): Operations allowed to wait for a slot.
+        timeout (float): Default seconds an operation may wait for a slot.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_active: int = MAX_CONCURRENT_PULLS,
+        max_queued: int = ADMISSION_QUEUE,
+        timeout: float = QUEUE_TIMEOUT,
+    ):
+        self.name = name
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def admit(self, deadline: float | None = None) -> AsyncIterator[None]:
+        """Hold a slot for the enclosed block.
+
+        Args:
+            deadline (float, optional): ``time.monotonic()`` deadline of the
+                request; the wait ends at it or after ``timeout``, whichever is first.
+        Raises:
+            OverloadedError: If the queue is full or no slot frees up before the deadline.
+        """
+        await self._acquire(deadline)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, deadline: float | None) -> None:
+        if self.active < self.max_active and not self.queued:
+            self.active += 1
+            return
+        if self.queued >= self.max_queued:
+            metrics.admission_rejections.inc(self.name, "queue_full")
+            raise OverloadedError(
+                f"Server is overloaded ({self.active} {self.name} running, {self.queued} queued); retry later",
+                retry_after=self.timeout,
+            )
+
+        give_up_at = time.monotonic() + self.timeout
+        if deadline is not None:
+            give_up_at = min(give_up_at, deadline)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(max(0.0, give_up_at - time.monotonic())):
+                await waiter
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as the wait timed out
+                return
+            metrics.admission_rejections.inc(self.name, "timeout")
+            raise OverloadedError(
+                f"Server is overloaded (waited {time.perf_counter() - start:.1f}s for a {self.name} slot); retry later",
+                retry_after=self.timeout,
+            ) from None
+        except BaseException:
+            # Pass on a slot handed over just as the wait was cancelled
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            metrics.admission_wait.observe(time.perf_counter() - start, self.name)
+
+    def _release(self) -> None:
+        # Hand the slot to the next waiter still waiting, if any
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` acquisitions per second with bursts of ``burst``.
+
+    ``acquire()`` reserves the next token and sleeps until it is due, so
+    callers are paced in arrival order without polling.
+
+    Args:
+        rate (float): Tokens added per second; 0 disables limiting.
+        burst (float): Bucket size.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: float = RATE_BURST):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return
+        wait = -self.tokens / self.rate
+        logging.debug(f"Rate limit reached; delaying upstream request by {wait * 1e3:.0f} ms")
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            # Return the reservation to the bucket
+            self.tokens += 1
+            raise
+        finally:
+            metrics.rate_limit_wait.observe(wait)
@@ -0,0 +1,234 @@
+"""Two-tier cache for parsed credit report pulls.
+
+The first tier is an in-process LRU bounded by entry count and total size in
+bytes, with a per-entry TTL. The optional second tier is a local SQLite file
+shared by restarts (and by other local processes), consulted on a memory miss.
+
+Keys are salted SHA-256 hashes of the applicant data (SSN, name, address)
+plus the request template fingerprint, so neither tier stores a raw SSN as a
+key and a changed request template never returns stale results. Cached values contain consumer data: keep the SQLite file on a
+private, local disk.
+
+Configuration (environment):
+
+    EXPERIAN_CACHE_TTL          seconds an entry stays valid, 0 disables (default 300)
+    EXPERIAN_CACHE_MAX_ENTRIES  in-memory entry limit (default 1024)
+    EXPERIAN_CACHE_MAX_BYTES    in-memory size limit in bytes (default 32 MiB)
+    EXPERIAN_CACHE_DB           path of the SQLite tier; unset disables it
+    EXPERIAN_CACHE_SALT         key salt; defaults to a random salt stored in
+                                the SQLite tier, or a per-process salt
+"""
+
+import hashlib
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+import anyio
+
+CACHE_TTL = float(os.getenv("EXPERIAN_CACHE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("EXPERIAN_CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("EXPERIAN_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class MemoryCache:
+    """LRU cache with per-entry expiry and entry-count and byte-size limits."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, int, object]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str):
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, size, value = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value, size: int, expires_at: float) -> None:
+        """Store a value of ``size`` bytes, evicting least recently used entries."""
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (expires_at, size, value)
+        self.size_bytes += size
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size_bytes -= size
+
+
+class SqliteCache:
+    """Persistent cache tier backed by a local SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        os.chmod(path, 0o600)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, expires_at REAL, value BLOB)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB)")
+        self.prune()
+
+    def salt(self) -> bytes:
+        """Return the salt stored with this cache, creating one on first use."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta (name, value) VALUES ('salt', ?)",
+                (secrets.token_bytes(16),),
+            )
+            return self._db.execute("SELECT value FROM meta WHERE name = 'salt'").fetchone()[0]
+
+    def get(self, key: str) -> tuple[float, bytes] | None:
+        """Return ``(expires_at, value)`` for an unexpired key, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at, value FROM results WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, expires_at, value),
+            )
+
+    def prune(self) -> int:
+        """Delete expired rows and return how many were removed."""
+        with self._lock:
+            return self._db.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+def _encode_json(value) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+class ResultCache:
+    """In-memory LRU in front of an optional SQLite tier, with hit/miss counters.
+
+    Values are stored as they are in memory and as ``encode``d bytes in the
+    SQLite tier; the encoded size is what counts towards ``max_bytes``.
+    Values returned from the memory tier are shared between callers and must
+    not be mutated.
+
+    Args:
+        encode: Serializes a value to bytes (default: compact JSON of a dict).
+        decode: Restores a value from ``encode``'s bytes (default: ``json.loads``).
+    """
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        db_path: str | None = None,
+        salt: str | None = None,
+        encode: Callable[[Any], bytes] = _encode_json,
+        decode: Callable[[bytes], Any] = json.loads,
+    ):
+        self.ttl = ttl
+        self.encode = encode
+        self.decode = decode
+        self.memory = MemoryCache(max_entries, max_bytes)
+        self.disk = SqliteCache(db_path) if db_path else None
+        if salt:
+            self._salt = salt.encode()
+        elif self.disk is not None:
+            self._salt = self.disk.salt()
+        else:
+            self._salt = secrets.token_bytes(16)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def stats(self) -> dict:
+        """Counters for logging and monitoring."""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.memory.evictions,
+            "entries": len(self.memory),
+            "size_bytes": self.memory.size_bytes,
+        }
+
+    def key_for(self, *parts: str) -> str:
+        """Return the salted hash identifying an upstream request from its parts."""
+        digest = hashlib.sha256(self._salt)
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, key: str):
+        if not self.enabled:
+            return None
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self.disk is not None:
+            try:
+                row = await anyio.to_thread.run_sync(self.disk.get, key)
+            except sqlite3.Error as e:
+                logging.warning(f"Could not read from cache {self.disk.path}: {e}")
+                row = None
+            if row is not None:
+                expires_at, blob = row
+                try:
+                    value = self.decode(blob)
+                except ValueError as e:
+                    logging.warning(f"Ignoring unreadable entry in cache {self.disk.path}: {e}")
+                    value = None
+            if value is not None:
+                self.memory.set(key, value, len(blob), expires_at)
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value) -> None:
+        if not self.enabled:
+            return
+        blob = self.encode(value)
+        expires_at = time.time() + self.ttl
+        self.memory.set(key, value, len(blob), expires_at)
+        if self.disk is not None:
+            try:
+                await anyio.to_thread.run_sync(self.disk.set, key, blob, expires_at)
+            except sqlite3.Error as e:
+                logging.warning(f"Could not write result to cache {self.disk.path}: {e}")
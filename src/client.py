@@ -12,6 +12,8 @@ from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from openai import OpenAI
 
+import tracing
+
 
 logging.basicConfig(level=logging.INFO)
 
@@ -31,33 +33,92 @@ def to_llm_tool(tool) -> dict:
     }
     return tool_schema
 
+def trace_meta(traceparent: str | None) -> dict | None:
+    """Return request ``_meta`` carrying ``traceparent``, or None when tracing is disabled."""
+    return {"traceparent": traceparent} if traceparent else None
+
+def with_trace_meta(params: dict | None, traceparent: str | None) -> dict:
+    """Return JSON-RPC params carrying ``traceparent`` in ``_meta`` so the server continues the trace."""
+    params = params or {}
+    if traceparent is None:
+        return params
+    return {**params, "_meta": {**params.get("_meta", {}), "traceparent": traceparent}}
+
+# Parameters of the initialize request sent by HttpMcpClient
+INITIALIZE_PARAMS = {
+    "protocolVersion": "2025-03-26",
+    "capabilities": {},
+    "clientInfo": {"name": "experian-mcp-client", "version": "0.1"}
+}
+
+async def log_progress(progress: float, total: float | None, message: str | None) -> None:
+    """Log a progress notification of a running tool call."""
+    logging.info(f"Progress {progress:g}{f'/{total:g}' if total else ''}: {message}")
+
 class HttpMcpClient:
-    """Simple HTTP client for MCP JSON-RPC over HTTP."""
+    """Simple HTTP client for MCP JSON-RPC over HTTP.
+
+    The session started by ``initialize`` is kept for the following calls and
+    ended by ``close()``.
+    """
     
     def __init__(self, url: str):
         self.url = url
         self.client = httpx.AsyncClient()
         self.request_id = 0
+        self.session_id = None
     
     async def close(self):
+        if self.session_id:
+            try:
+                await self.client.delete(self.url, headers={"mcp-session-id": self.session_id})
+            except httpx.HTTPError as e:
+                logging.warning(f"Could not end MCP session: {e}")
+            self.session_id = None
         await self.client.aclose()
     
-    async def call(self, method: str, params: dict = None) -> dict:
-        """Make a JSON-RPC call to the MCP server."""
+    def _headers(self, traceparent: str | None) -> dict:
+        headers = {"traceparent": traceparent} if traceparent else {}
+        if self.session_id:
+            headers["mcp-session-id"] = self.session_id
+        return headers
+    
+    def _keep_session(self, response: httpx.Response) -> None:
+        # The server names the session in its reply to initialize
+        self.session_id = response.headers.get("mcp-session-id", self.session_id)
+    
+    async def call(self, method: str, params: dict = None, on_progress=None) -> dict:
+        """Make a JSON-RPC call to the MCP server.
+        Args:
+            method (str): JSON-RPC method.
+            params (dict, optional): Method parameters.
+            on_progress (optional): Coroutine function called with the
+                ``progress``, ``total`` and ``message`` of each progress
+                notification the server streams while handling the call.
+        """
         self.request_id += 1
-        request = {
-            "jsonrpc": "2.0",
-            "id": self.request_id,
-            "method": method,
-            "params": params or {}
-        }
-        
-        logging.debug(f"Sending request: {json.dumps(request, indent=2)}")
-        
-        response = await self.client.post(self.url, json=request)
-        response.raise_for_status()
+        with tracing.span(f"mcp {method}", kind="client") as span:
+            request = {
+                "jsonrpc": "2.0",
+                "id": self.request_id,
+                "method": method,
+                "params": with_trace_meta(params, span.traceparent)
+            }
+            
+            logging.debug(f"Sending request: {json.dumps(request, indent=2)}")
+            
+            headers = self._headers(span.traceparent)
+            if on_progress is None:
+                response = await self.client.post(self.url, json=request, headers=headers)
+                response.raise_for_status()
+                self._keep_session(response)
+                result = response.json()
+            else:
+                params = request["params"]
+                request["params"] = {**params, "_meta": {**params.get("_meta", {}), "progressToken": self.request_id}}
+                headers["accept"] = "application/json, text/event-stream"
+                result = await self._stream(request, headers, on_progress)
         
-        result = response.json()
         logging.debug(f"Received response: {json.dumps(result, indent=2)}")
         
         if "error" in result:
@@ -65,18 +126,74 @@ class HttpMcpClient:
         
         return result.get("result", {})
     
+    async def _stream(self, request: dict, headers: dict, on_progress) -> dict:
+        """Send a request and return its response, passing streamed progress notifications to ``on_progress``."""
+        async with self.client.stream("POST", self.url, json=request, headers=headers) as response:
+            response.raise_for_status()
+            self._keep_session(response)
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                await response.aread()
+                return response.json()
+            # Server-sent events: progress notifications, then the response
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                message = json.loads(line[5:])
+                if message.get("method") == "notifications/progress":
+                    params = message.get("params", {})
+                    await on_progress(params.get("progress"), params.get("total"), params.get("message"))
+                elif message.get("id") == request["id"]:
+                    return message
+        raise Exception("MCP error: event stream ended without a response")
+    
+    async def batch(self, calls: list[tuple[str, dict]]) -> list[dict]:
+        """Send several JSON-RPC calls in one HTTP round trip.
+        Args:
+            calls: (method, params) pairs.
+        Returns:
+            list[dict]: The result of each call, in the order given.
+        """
+        with tracing.span("mcp batch", kind="client", **{"rpc.batch_size": len(calls)}) as span:
+            requests = []
+            for method, params in calls:
+                self.request_id += 1
+                requests.append({
+                    "jsonrpc": "2.0",
+                    "id": self.request_id,
+                    "method": method,
+                    "params": with_trace_meta(params, span.traceparent)
+                })
+            
+            logging.debug(f"Sending batch: {json.dumps(requests, indent=2)}")
+            
+            response = await self.client.post(self.url, json=requests, headers=self._headers(span.traceparent))
+            response.raise_for_status()
+            self._keep_session(response)
+        
+        # The server may answer batch members in any order; match them by id
+        responses = {item.get("id"): item for item in response.json()}
+        logging.debug(f"Received batch response: {json.dumps(responses, indent=2)}")
+        
+        results = []
+        for request in requests:
+            result = responses.get(request["id"], {"error": "missing response"})
+            if "error" in result:
+                raise Exception(f"MCP error: {result['error']}")
+            results.append(result.get("result", {}))
+        return results
+    
     async def initialize(self):
         """Initialize the MCP session."""
-        return await self.call("initialize", {})
+        return await self.call("initialize", INITIALIZE_PARAMS)
     
     async def list_tools(self):
         """List available tools."""
         result = await self.call("tools/list", {})
         return result.get("tools", [])
     
-    async def call_tool(self, name: str, arguments: dict):
-        """Call a tool."""
-        result = await self.call("tools/call", {"name": name, "arguments": arguments})
+    async def call_tool(self, name: str, arguments: dict, on_progress=None):
+        """Call a tool, passing its progress notifications to ``on_progress`` if given."""
+        result = await self.call("tools/call", {"name": name, "arguments": arguments}, on_progress=on_progress)
         return result
     
     async def list_prompts(self):
@@ -110,11 +227,15 @@ def parse_args():
 async def main():
     """Main test function."""
     args = parse_args()
+    tracing.configure("experian-mcp-client")
     
     if args.transport == 'http':
         # Use HTTP transport
         logging.info(f"Connecting to MCP server via HTTP at {args.url}")
-        await run_http_client(args.url)
+        with tracing.span("client.run_http") as span:
+            if span.trace_id:
+                logging.info(f"Trace id: {span.trace_id}")
+            await run_http_client(args.url)
     else:
         # Use stdio transport
         logging.info("Connecting to MCP server via stdio")
@@ -125,19 +246,27 @@ async def main():
         )
         
         async with stdio_client(server_params) as (read, write):
-            await run_client_session(read, write)
+            with tracing.span("client.run_stdio") as span:
+                if span.trace_id:
+                    logging.info(f"Trace id: {span.trace_id}")
+                await run_client_session(read, write)
 
 async def run_http_client(url: str):
     """Run the client with HTTP transport."""
     client = HttpMcpClient(url)
     
     try:
-        # Initialize
-        await client.initialize()
+        # Initialize, discover tools and prompts and fetch the credit report in one round trip
+        _, tools_result, prompts_result, result = await client.batch([
+            ("initialize", INITIALIZE_PARAMS),
+            ("tools/list", {}),
+            ("prompts/list", {}),
+            ("tools/call", {"name": "credit_score", "arguments": {"ssn": "123-45-6789"}}),
+        ])
         
         # Test MCP server
         available_tools = []
-        tools = await client.list_tools()
+        tools = tools_result.get("tools", [])
         logging.debug(f"Available tools: {[tool['name'] for tool in tools]}\n")
         logging.debug("Tools details:")
         for tool in tools:
@@ -156,11 +285,7 @@ async def run_http_client(url: str):
         
         logging.debug(f'Available tools converted to LLM schema: {available_tools}\n')
 
-        # Test the credit_score tool
-        logging.debug("Testing credit_score tool:")
-        result = await client.call_tool("credit_score", {"ssn": "123-45-6789"})
-        
-        # Parse the result
+        # Parse the credit_score tool result
         credit_result = json.loads(result["content"][0]["text"])
         
         score = credit_result.get('credit_score_info', {}).get('score', 0)
@@ -174,11 +299,11 @@ async def run_http_client(url: str):
         
         # Test the prompt
         logging.debug("Testing build_credit_score_prompt:")
-        prompts = await client.list_prompts()
+        prompts = prompts_result.get("prompts", [])
         logging.info(f"Available prompts: {[p['name'] for p in prompts]}")
         
-        # Note: The HTTP server doesn't implement prompts/get, so we'll create the prompt directly
-        prompt = "You are a financial loan officer assistant. Generate an extensive loan risk assessment for this applicant given a SSN of 123-45-6789."
+        prompt_result = await client.get_prompt("build_credit_score_prompt", {"credit_report": json.dumps(credit_result)})
+        prompt = prompt_result["messages"][0]["content"]["text"]
         logging.debug(f"Using prompt: {prompt}\n")
         
         # Call LLM with the prompt and available tools
@@ -211,14 +336,15 @@ async def call_llm_and_process(prompt: str, available_tools: list, mcp_client, c
     ]
     
     print("CALLING LLM")
-    response = client.chat.completions.create(
-        messages=messages,
-        model=model_name,
-        tools=available_tools,
-        temperature=1.,
-        max_tokens=1000,
-        top_p=1.    
-    )
+    with tracing.span("llm.chat", kind="client", **{"llm.model": model_name}):
+        response = client.chat.completions.create(
+            messages=messages,
+            model=model_name,
+            tools=available_tools,
+            temperature=1.,
+            max_tokens=1000,
+            top_p=1.    
+        )
     
     response_message = response.choices[0].message
     
@@ -237,10 +363,16 @@ async def call_llm_and_process(prompt: str, available_tools: list, mcp_client, c
             
             # Call the MCP tool
             if isinstance(mcp_client, HttpMcpClient):
-                result = await mcp_client.call_tool(tool_name, arguments=tool_args)
+                result = await mcp_client.call_tool(tool_name, arguments=tool_args, on_progress=log_progress)
                 tool_result = result["content"][0]["text"]
             else:
-                result = await mcp_client.call_tool(tool_name, arguments=tool_args)
+                with tracing.span(f"mcp tools/call {tool_name}", kind="client") as span:
+                    result = await mcp_client.call_tool(
+                        tool_name,
+                        arguments=tool_args,
+                        meta=trace_meta(span.traceparent),
+                        progress_callback=log_progress
+                    )
                 tool_result = result.content[0].text
             
             logging.debug(f"Tool result: {tool_result}\n")
@@ -254,14 +386,15 @@ async def call_llm_and_process(prompt: str, available_tools: list, mcp_client, c
         
         # Call LLM again with tool results to generate final assessment
         logging.info("Calling LLM again with tool results to generate risk assessment...")
-        final_response = client.chat.completions.create(
-            messages=messages,
-            model=model_name,
-            tools=available_tools,
-            temperature=1.,
-            max_tokens=1000,
-            top_p=1.    
-        )
+        with tracing.span("llm.chat", kind="client", **{"llm.model": model_name}):
+            final_response = client.chat.completions.create(
+                messages=messages,
+                model=model_name,
+                tools=available_tools,
+                temperature=1.,
+                max_tokens=1000,
+                top_p=1.    
+            )
         
         final_message = final_response.choices[0].message.content
         print("\n" + "="*60)
@@ -292,7 +425,13 @@ async def run_client_session(read, write):
 
         # Test the credit_score tool
         logging.debug("Testing credit_score tool:")
-        result = await session.call_tool("credit_score", {"ssn": "123-45-6789"})
+        with tracing.span("mcp tools/call credit_score", kind="client") as span:
+            result = await session.call_tool(
+                "credit_score",
+                {"ssn": "123-45-6789"},
+                meta=trace_meta(span.traceparent),
+                progress_callback=log_progress
+            )
         
         # Parse the result
         credit_result = json.loads(result.content[0].text)
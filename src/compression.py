@@ -0,0 +1,119 @@
+"""Compression of HTTP responses, negotiated with ``Accept-Encoding``.
+
+Tool results are repetitive JSON (a full credit profile is about 180 KB and
+compresses roughly tenfold), so remote clients spend less time receiving them
+when they are compressed. Bodies smaller than ``EXPERIAN_COMPRESSION_MIN_SIZE``
+are sent as they are: for those the CPU time outweighs the bytes saved.
+Bodies of ``EXPERIAN_COMPRESSION_THREAD_SIZE`` or more are compressed in a
+worker thread by ``compress_async``, since gzip takes milliseconds for a few
+hundred KB and would stall every other request on the event loop meanwhile;
+smaller ones take well under a millisecond and are compressed inline.
+
+``zstd`` needs the ``zstandard`` package (``pip install zstandard`` or the
+``fast`` extra); without it only ``gzip`` is offered.
+``uv run testing/bench_compression.py`` shows the bytes and CPU time of each
+encoding and level for typical responses.
+
+    EXPERIAN_COMPRESSION              encodings offered, in order of preference; empty disables (default "zstd,gzip")
+    EXPERIAN_COMPRESSION_MIN_SIZE     smallest body in bytes that is compressed (default 1024)
+    EXPERIAN_COMPRESSION_THREAD_SIZE  smallest body compressed in a worker thread (default 65536)
+    EXPERIAN_GZIP_LEVEL               gzip level, 1-9 (default 1)
+    EXPERIAN_ZSTD_LEVEL               zstd level, 1-22 (default 3)
+"""
+
+import asyncio
+import gzip
+import os
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("EXPERIAN_COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_THREAD_SIZE = int(os.getenv("EXPERIAN_COMPRESSION_THREAD_SIZE", "65536"))
+GZIP_LEVEL = int(os.getenv("EXPERIAN_GZIP_LEVEL", "1"))
+ZSTD_LEVEL = int(os.getenv("EXPERIAN_ZSTD_LEVEL", "3"))
+
+_compressors = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0),
+}
+if zstandard is not None:
+    # A ZstdCompressor must not be used by two threads at once, so each thread gets its own
+    _local = threading.local()
+
+    def _zstd_compress(data: bytes) -> bytes:
+        compressor = getattr(_local, "zstd", None)
+        if compressor is None:
+            compressor = _local.zstd = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        return compressor.compress(data)
+
+    _compressors["zstd"] = _zstd_compress
+
+# Encodings offered, most preferred first; ones whose library is missing are left out
+ENCODINGS = tuple(
+    name.strip()
+    for name in os.getenv("EXPERIAN_COMPRESSION", "zstd,gzip").split(",")
+    if name.strip() in _compressors
+)
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Return the quality value of each coding listed in an ``Accept-Encoding`` header."""
+    qualities = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+    return qualities
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """Return the offered encoding the client accepts most, ties going to the server's preference.
+    Args:
+        accept_encoding (str, optional): The request's ``Accept-Encoding`` header.
+    Returns:
+        str: The encoding to use, or None to send the body uncompressed.
+    """
+    if not accept_encoding or not ENCODINGS:
+        return None
+    qualities = parse_accept_encoding(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in ENCODINGS:
+        q = qualities.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(body: bytes, accept_encoding: str | None) -> tuple[bytes, str | None]:
+    """Compress a response body with the encoding negotiated from ``Accept-Encoding``.
+    Returns:
+        tuple: The body to send and its ``Content-Encoding``, or None if it was left uncompressed.
+    """
+    encoding = choose_encoding(accept_encoding) if len(body) >= COMPRESSION_MIN_SIZE else None
+    if encoding is None:
+        return body, None
+    return _compressors[encoding](body), encoding
+
+
+async def compress_async(body: bytes, accept_encoding: str | None) -> tuple[bytes, str | None]:
+    """Like ``compress()``, but compresses large bodies in a worker thread off the event loop."""
+    encoding = choose_encoding(accept_encoding) if len(body) >= COMPRESSION_MIN_SIZE else None
+    if encoding is None:
+        return body, None
+    if len(body) < COMPRESSION_THREAD_SIZE:
+        return _compressors[encoding](body), encoding
+    return await asyncio.to_thread(_compressors[encoding], body), encoding
@@ -0,0 +1,286 @@
+"""Typed model of the credit profile sections served by the tools.
+
+Each section of ``creditProfile[0]`` in ``REPORT_SECTIONS`` is a ``msgspec``
+Struct with one attribute per field of the Experian response. ``decode_report``
+decodes a response body straight into these classes in one pass: sections and
+fields outside the schema (``covidSpotlightAttributes``, ``endTotals``, ...)
+are skipped without being built, and every record is a slotted object instead
+of a dict, so a decoded profile takes a fraction of the memory of the
+equivalent dicts (``uv run testing/bench_report_parser.py`` measures both).
+
+Field names and values are kept as Experian sends them: camelCase names and
+string values (``score`` is ``"0783"``), so a profile encodes back to the same
+JSON it was decoded from, less any fields the schema does not declare. A field
+that is missing is None (or an empty list) and is left out when encoding.
+Records are frozen, since decoded profiles are cached and shared by callers.
+"""
+
+import msgspec
+
+
+class Record(msgspec.Struct, kw_only=True, omit_defaults=True, frozen=True, gc=False):
+    """Base of the credit profile records.
+
+    Decoded records never reference each other in cycles, so they are not
+    tracked by the garbage collector.
+    """
+
+
+class HeaderRecord(Record):
+    reportDate: str | None = None
+    reportTime: str | None = None
+    preamble: str | None = None
+    versionNo: str | None = None
+    mKeywordLength: str | None = None
+    mKeywordText: str | None = None
+    y2kReportedDate: str | None = None
+
+
+class Dob(Record):
+    day: str | None = None
+    month: str | None = None
+    year: str | None = None
+
+
+class Name(Record):
+    firstName: str | None = None
+    middleName: str | None = None
+    surname: str | None = None
+    type: str | None = None
+
+
+class Phone(Record):
+    number: str | None = None
+    source: str | None = None
+
+
+class ConsumerIdentity(Record):
+    dob: Dob | None = None
+    name: list[Name] = []
+    phone: list[Phone] = []
+
+    @property
+    def primary_name(self) -> Name:
+        """The first name on the report, or an empty one."""
+        return self.name[0] if self.name else _NO_NAME
+
+
+class ScoreFactor(Record):
+    importance: str | None = None
+    code: str | None = None
+
+
+class RiskModel(Record):
+    evaluation: str | None = None
+    modelIndicator: str | None = None
+    score: str | None = None
+    scoreFactors: list[ScoreFactor] = []
+
+
+class Ssn(Record):
+    number: str | None = None
+    ssnIndicators: str | None = None
+
+
+class AddressInformation(Record):
+    city: str | None = None
+    dwellingType: str | None = None
+    firstReportedDate: str | None = None
+    lastReportingSubscriberCode: str | None = None
+    lastUpdatedDate: str | None = None
+    source: str | None = None
+    state: str | None = None
+    streetName: str | None = None
+    streetPrefix: str | None = None
+    streetSuffix: str | None = None
+    timesReported: str | None = None
+    zipCode: str | None = None
+
+
+class Inquiry(Record):
+    amount: str | None = None
+    date: str | None = None
+    kob: str | None = None
+    subscriberCode: str | None = None
+    subscriberName: str | None = None
+    terms: str | None = None
+    type: str | None = None
+
+
+class PublicRecord(Record):
+    amount: str | None = None
+    bookPageSequence: str | None = None
+    courtCode: str | None = None
+    courtName: str | None = None
+    ecoa: str | None = None
+    evaluation: str | None = None
+    filingDate: str | None = None
+    status: str | None = None
+    statusDate: str | None = None
+    referenceNumber: str | None = None
+
+
+class SummaryAttribute(Record):
+    id: str | None = None
+    value: str | None = None
+
+
+class Summary(Record):
+    summaryType: str | None = None
+    attributes: list[SummaryAttribute] = []
+
+
+class EnhancedPaymentData(Record):
+    complianceCondition: str | None = None
+    creditLimitAmount: str | None = None
+    enhancedAccountCondition: str | None = None
+    enhancedAccountType: str | None = None
+    enhancedPaymentHistory84: str | None = None
+    enhancedPaymentStatus: str | None = None
+    enhancedSpecialComment: str | None = None
+    enhancedTerms: str | None = None
+    enhancedTermsFrequency: str | None = None
+    firstDelinquencyDate: str | None = None
+    highBalanceAmount: str | None = None
+    maxDelinquencyCode: str | None = None
+    originalLoanAmount: str | None = None
+    paymentLevelDate: str | None = None
+    secondDelinquencyDate: str | None = None
+    secondaryAgencyCode: str | None = None
+    secondaryAgencyId: str | None = None
+
+
+class Tradeline(Record):
+    accountNumber: str | None = None
+    accountType: str | None = None
+    amount1: str | None = None
+    amount1Qualifier: str | None = None
+    amount2: str | None = None
+    amount2Qualifier: str | None = None
+    balanceAmount: str | None = None
+    balanceDate: str | None = None
+    delinquencies30Days: str | None = None
+    delinquencies60Days: str | None = None
+    delinquencies90to180Days: str | None = None
+    derogCounter: str | None = None
+    ecoa: str | None = None
+    enhancedPaymentData: EnhancedPaymentData | None = None
+    evaluation: str | None = None
+    kob: str | None = None
+    lastPaymentDate: str | None = None
+    maxDelinquencyDate: str | None = None
+    monthlyPaymentAmount: str | None = None
+    monthlyPaymentType: str | None = None
+    monthsHistory: str | None = None
+    openDate: str | None = None
+    openOrClosed: str | None = None
+    paymentHistory: str | None = None
+    revolvingOrInstallment: str | None = None
+    specialComment: str | None = None
+    status: str | None = None
+    statusDate: str | None = None
+    subscriberCode: str | None = None
+    subscriberName: str | None = None
+    terms: str | None = None
+
+    @property
+    def credit_limit(self) -> str | None:
+        """The enhanced ``creditLimitAmount``, else ``amount1`` when it is qualified as a limit."""
+        if self.enhancedPaymentData is not None and self.enhancedPaymentData.creditLimitAmount:
+            return self.enhancedPaymentData.creditLimitAmount
+        return self.amount1 if self.amount1Qualifier == "L" else None
+
+
+class CreditProfile(Record):
+    """The ``REPORT_SECTIONS`` of ``creditProfile[0]``; sections not in the report are None."""
+
+    headerRecord: list[HeaderRecord] | None = None
+    addressInformation: list[AddressInformation] | None = None
+    consumerIdentity: ConsumerIdentity | None = None
+    inquiry: list[Inquiry] | None = None
+    summaries: list[Summary] | None = None
+    publicRecord: list[PublicRecord] | None = None
+    riskModel: list[RiskModel] | None = None
+    ssn: list[Ssn] | None = None
+    tradeline: list[Tradeline] | None = None
+
+    @property
+    def header(self) -> HeaderRecord:
+        """The report's header record, or an empty one."""
+        return self.headerRecord[0] if self.headerRecord else _NO_HEADER
+
+    @property
+    def identity(self) -> ConsumerIdentity:
+        """The consumer identity, or an empty one."""
+        return self.consumerIdentity if self.consumerIdentity is not None else _NO_IDENTITY
+
+    @property
+    def risk_model(self) -> RiskModel | None:
+        """The first risk model (the credit score), if the report has one."""
+        return self.riskModel[0] if self.riskModel else None
+
+    def sections(self) -> dict:
+        """Return the sections present in the profile by name."""
+        return {
+            name: value
+            for name in self.__struct_fields__
+            if (value := getattr(self, name)) is not None
+        }
+
+
+class CreditReport(Record):
+    """A credit report response; only ``creditProfile`` is decoded."""
+
+    creditProfile: list[CreditProfile] = []
+
+
+_NO_HEADER = HeaderRecord()
+_NO_NAME = Name()
+_NO_IDENTITY = ConsumerIdentity()
+
+# Type of each section of CreditProfile, for decoding sections one at a time
+SECTION_TYPES = {field.name: field.type for field in msgspec.structs.fields(CreditProfile)}
+
+_report_decoder = msgspec.json.Decoder(CreditReport)
+_profile_decoder = msgspec.json.Decoder(CreditProfile)
+_encoder = msgspec.json.Encoder()
+
+# Raised for invalid JSON and for values of the wrong type
+DecodeError = msgspec.DecodeError
+
+
+def decode_report(body: bytes) -> CreditProfile:
+    """Decode a credit report response body into its first credit profile.
+    Returns:
+        CreditProfile: The first profile, or an empty one if the report has none.
+    Raises:
+        DecodeError: If the body is not valid JSON or does not match the schema.
+    """
+    profiles = _report_decoder.decode(body).creditProfile
+    return profiles[0] if profiles else CreditProfile()
+
+
+def decode_section(name: str, value):
+    """Convert a section parsed into dicts and lists to its typed form.
+    Raises:
+        DecodeError: If the value does not match the section's schema.
+    """
+    return msgspec.convert(value, SECTION_TYPES[name])
+
+
+def encode(profile: CreditProfile) -> bytes:
+    """Encode a profile as compact JSON, e.g. for the cache's SQLite tier."""
+    return _encoder.encode(profile)
+
+
+def decode(blob: bytes) -> CreditProfile:
+    """Decode a profile encoded by ``encode``.
+    Raises:
+        DecodeError: If the blob is not a valid encoded profile.
+    """
+    return _profile_decoder.decode(blob)
+
+
+def to_builtins(value):
+    """Convert records (and lists of them) to the dicts and lists they were decoded from."""
+    return msgspec.to_builtins(value)
@@ -0,0 +1,97 @@
+"""Per-request deadlines.
+
+``scope()`` gives the enclosed block a deadline, tracked in a context variable
+so code further down (admission queue waits, retry backoff) can see how much
+time is left. When it passes, the block is cancelled, which aborts any
+upstream I/O it is waiting on, and ``DeadlineExceeded`` is raised. Work
+shared by several requests runs ``cleared()`` of the deadline of the one that
+started it; each request stops waiting for it at its own deadline.
+
+Clients set a timeout in seconds per call with ``params._meta.timeout``;
+otherwise ``EXPERIAN_REQUEST_TIMEOUT`` applies (default 120, 0 for none).
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator
+
+REQUEST_TIMEOUT = float(os.getenv("EXPERIAN_REQUEST_TIMEOUT", "120"))
+
+# time.monotonic() value by which the current request must finish
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request runs past its deadline."""
+
+
+def current() -> float | None:
+    """Return the ``time.monotonic()`` deadline of the current request, if any."""
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    """Return the seconds left until the current request's deadline, if it has one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def cleared() -> Iterator[None]:
+    """Run the enclosed block without the current request's deadline."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def timeout_from_meta(meta) -> float | None:
+    """Return the positive ``timeout`` in seconds from a request's ``_meta``, if set.
+
+    Args:
+        meta: ``params._meta`` as a dict, or the MCP SDK's request meta model.
+    """
+    value = meta.get("timeout") if isinstance(meta, dict) else getattr(meta, "timeout", None)
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    return None
+
+
+@asynccontextmanager
+async def scope(timeout: float | None = None) -> AsyncIterator[None]:
+    """Run the enclosed block with a deadline ``timeout`` seconds from now.
+
+    An enclosing deadline that is earlier is kept.
+
+    Args:
+        timeout (float, optional): Seconds the block may take (default:
+            ``REQUEST_TIMEOUT``; 0 for no deadline of its own).
+    Raises:
+        DeadlineExceeded: If the block was cancelled because the deadline passed.
+    """
+    if timeout is None:
+        timeout = REQUEST_TIMEOUT
+    enclosing = _deadline.get()
+    start = time.monotonic()
+    deadline = start + timeout if timeout > 0 else None
+    if enclosing is not None and (deadline is None or enclosing < deadline):
+        deadline = enclosing
+    if deadline is None:
+        yield
+        return
+
+    token = _deadline.set(deadline)
+    loop = asyncio.get_running_loop()
+    try:
+        async with asyncio.timeout_at(loop.time() + deadline - time.monotonic()):
+            yield
+    except TimeoutError as e:
+        if time.monotonic() < deadline:
+            raise
+        raise DeadlineExceeded(f"Request did not complete within its {deadline - start:.3g}s deadline") from e
+    finally:
+        _deadline.reset(token)
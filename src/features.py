@@ -0,0 +1,212 @@
+"""Vectorized underwriting features from credit profiles.
+
+``ProfileColumns`` flattens the ``tradeline``, ``inquiry`` and ``publicRecord``
+arrays of any number of credit profiles into columnar numpy arrays, one row per
+item plus the index of the profile it belongs to. ``compute_features`` then
+reduces every column per profile with grouped numpy operations, so the cost
+per profile is a handful of array operations shared by the whole batch rather
+than a Python loop over each report.
+
+Amounts and counts that are missing or not numeric (Experian uses values such
+as ``UNKNOWN``) become NaN and are left out of sums and averages. Dates are
+Experian ``MMDDYYYY`` strings; ages and inquiry windows are measured from the
+report date in ``headerRecord`` (today if a profile has none).
+"""
+
+import time
+
+import numpy as np
+
+from credit_profile import CreditProfile
+
+DAYS_PER_MONTH = 365.25 / 12
+
+# Feature names in output order
+FEATURES = (
+    "tradeline_count",
+    "open_tradeline_count",
+    "open_balance",
+    "revolving_balance",
+    "revolving_limit",
+    "revolving_utilization",
+    "delinquencies_30_days",
+    "delinquencies_60_days",
+    "delinquencies_90_to_180_days",
+    "derogatory_count",
+    "delinquent_account_count",
+    "oldest_account_age_months",
+    "newest_account_age_months",
+    "mean_account_age_months",
+    "inquiry_count",
+    "inquiries_last_6_months",
+    "inquiries_last_12_months",
+    "public_record_count",
+    "public_record_amount",
+)
+
+
+def _numbers(values: list) -> np.ndarray:
+    """Convert digit strings to float64, with NaN for missing or non-numeric values."""
+    return np.array(
+        [float(v) if isinstance(v, str) and v.isdigit() else np.nan for v in values],
+        dtype=np.float64,
+    )
+
+
+def _dates(values: list) -> np.ndarray:
+    """Convert ``MMDDYYYY`` strings to float64 days since 1970-01-01, NaN if invalid."""
+    n = len(values)
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+    # Decode all dates at once from their ASCII digits
+    raw = np.array(
+        [v if isinstance(v, str) and len(v) == 8 and v.isascii() else "" for v in values],
+        dtype="S8",
+    ).view(np.uint8).reshape(n, 8)
+    digits = raw.astype(np.int64) - 48
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    month = digits[:, 0] * 10 + digits[:, 1]
+    day = digits[:, 2] * 10 + digits[:, 3]
+    year = digits[:, 4] * 1000 + digits[:, 5] * 100 + digits[:, 6] * 10 + digits[:, 7]
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0)
+    days = months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) + day - 1
+    return np.where(valid, days.astype(np.float64), np.nan)
+
+
+class ProfileColumns:
+    """Tradeline, inquiry and public record fields of many profiles as flat arrays.
+
+    Each ``*_profile`` array holds the index of the profile every row belongs
+    to; the other arrays hold one field per row.
+
+    Args:
+        profiles (list[CreditProfile]): Credit profiles.
+        today (float, optional): Days since 1970-01-01 used as the report date
+            for profiles without one (default: the current date).
+    """
+
+    def __init__(self, profiles: list[CreditProfile], today: float | None = None):
+        self.count = len(profiles)
+        if today is None:
+            today = float(time.time() // 86400)
+
+        report_date = _dates([p.header.y2kReportedDate for p in profiles])
+        self.report_date = np.where(np.isnan(report_date), today, report_date)
+
+        tradelines = [p.tradeline or [] for p in profiles]
+        self.tradeline_profile = self._owners(tradelines)
+        rows = [t for items in tradelines for t in items]
+        self.revolving = np.array([t.revolvingOrInstallment == "R" for t in rows], dtype=bool)
+        self.open = np.array([t.openOrClosed == "O" for t in rows], dtype=bool)
+        self.balance = _numbers([t.balanceAmount for t in rows])
+        self.credit_limit = _numbers([t.credit_limit for t in rows])
+        self.open_date = _dates([t.openDate for t in rows])
+        self.delinquencies_30 = _numbers([t.delinquencies30Days for t in rows])
+        self.delinquencies_60 = _numbers([t.delinquencies60Days for t in rows])
+        self.delinquencies_90 = _numbers([t.delinquencies90to180Days for t in rows])
+        self.derogatory = _numbers([t.derogCounter for t in rows])
+
+        inquiries = [p.inquiry or [] for p in profiles]
+        self.inquiry_profile = self._owners(inquiries)
+        self.inquiry_date = _dates([i.date for items in inquiries for i in items])
+
+        records = [p.publicRecord or [] for p in profiles]
+        self.public_record_profile = self._owners(records)
+        self.public_record_amount = _numbers([r.amount for items in records for r in items])
+
+    @staticmethod
+    def _owners(groups: list[list]) -> np.ndarray:
+        return np.repeat(np.arange(len(groups)), [len(items) for items in groups])
+
+
+def _sum(owner: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Per-profile sum of ``values``, ignoring NaN."""
+    return np.bincount(owner, weights=np.nan_to_num(values), minlength=count).astype(np.float64, copy=False)
+
+
+def _reduce(ufunc, owner: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Per-profile ``np.fmin``/``np.fmax`` of ``values``; NaN where a profile has none."""
+    out = np.full(count, np.nan)
+    ufunc.at(out, owner, values)
+    return out
+
+
+def compute_features(columns: ProfileColumns) -> dict[str, np.ndarray]:
+    """Compute every feature in FEATURES for all profiles at once.
+
+    Returns:
+        dict[str, np.ndarray]: One float64 array of length ``columns.count``
+        per feature; NaN where a feature is undefined (e.g. utilization
+        without any open revolving limit, account age without tradelines).
+    """
+    n = columns.count
+    owner = columns.tradeline_profile
+    revolving_open = columns.revolving & columns.open
+    ones = np.ones(len(owner))
+
+    revolving_known = revolving_open & ~np.isnan(columns.balance) & (np.nan_to_num(columns.credit_limit) > 0)
+    revolving_balance = _sum(owner, np.where(revolving_open, columns.balance, np.nan), n)
+    utilization_balance = _sum(owner, np.where(revolving_known, columns.balance, np.nan), n)
+    utilization_limit = _sum(owner, np.where(revolving_known, columns.credit_limit, np.nan), n)
+
+    delinquent = (
+        (np.nan_to_num(columns.delinquencies_30) > 0)
+        | (np.nan_to_num(columns.delinquencies_60) > 0)
+        | (np.nan_to_num(columns.delinquencies_90) > 0)
+        | (np.nan_to_num(columns.derogatory) > 0)
+    )
+
+    age = (columns.report_date[owner] - columns.open_date) / DAYS_PER_MONTH
+    dated = ~np.isnan(age)
+    dated_accounts = np.bincount(owner[dated], minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        utilization = np.where(utilization_limit > 0, utilization_balance / utilization_limit, np.nan)
+        mean_age = np.where(dated_accounts > 0, _sum(owner, age, n) / dated_accounts, np.nan)
+
+    inquiry_age = columns.report_date[columns.inquiry_profile] - columns.inquiry_date
+    inquiry_owner = columns.inquiry_profile
+
+    return {
+        "tradeline_count": _sum(owner, ones, n),
+        "open_tradeline_count": _sum(owner, columns.open.astype(np.float64), n),
+        "open_balance": _sum(owner, np.where(columns.open, columns.balance, np.nan), n),
+        "revolving_balance": revolving_balance,
+        "revolving_limit": _sum(owner, np.where(revolving_open, columns.credit_limit, np.nan), n),
+        "revolving_utilization": utilization,
+        "delinquencies_30_days": _sum(owner, columns.delinquencies_30, n),
+        "delinquencies_60_days": _sum(owner, columns.delinquencies_60, n),
+        "delinquencies_90_to_180_days": _sum(owner, columns.delinquencies_90, n),
+        "derogatory_count": _sum(owner, columns.derogatory, n),
+        "delinquent_account_count": _sum(owner, delinquent.astype(np.float64), n),
+        "oldest_account_age_months": _reduce(np.fmax, owner, age, n),
+        "newest_account_age_months": _reduce(np.fmin, owner, age, n),
+        "mean_account_age_months": mean_age,
+        "inquiry_count": np.bincount(inquiry_owner, minlength=n).astype(np.float64),
+        "inquiries_last_6_months": _sum(inquiry_owner, (inquiry_age <= 6 * DAYS_PER_MONTH).astype(np.float64), n),
+        "inquiries_last_12_months": _sum(inquiry_owner, (inquiry_age <= 12 * DAYS_PER_MONTH).astype(np.float64), n),
+        "public_record_count": np.bincount(columns.public_record_profile, minlength=n).astype(np.float64),
+        "public_record_amount": _sum(columns.public_record_profile, columns.public_record_amount, n),
+    }
+
+
+def extract_features(profiles: list[CreditProfile], today: float | None = None) -> list[dict]:
+    """Compute features for a batch of profiles as JSON-ready dicts.
+
+    Counts are returned as ints, amounts, ratios and ages rounded to four decimals,
+    and undefined features as None.
+    """
+    features = compute_features(ProfileColumns(profiles, today))
+    rows = [{} for _ in profiles]
+    for name in FEATURES:
+        values = features[name]
+        is_count = name.endswith("_count") or name.startswith(("delinquencies", "inquiries"))
+        for row, value in zip(rows, values.tolist()):
+            if value != value:
+                row[name] = None
+            elif is_count:
+                row[name] = int(value)
+            else:
+                row[name] = round(value, 4)
+    return rows
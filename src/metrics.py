@@ -0,0 +1,200 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain dicts keyed by label values, updated
+from the event loop without locks, so recording a sample costs a dict lookup
+and an addition. ``render()`` formats every registered metric for the HTTP
+transport's ``/metrics`` endpoint. Values that other components already count
+(cache hits, token refreshes, in-flight pulls) are read at scrape time
+through ``Callback`` metrics instead of being counted twice.
+
+Each worker process has its own registry: with ``--workers N`` a scrape
+returns the numbers of whichever worker answered it.
+"""
+
+import bisect
+from typing import Callable
+
+# Seconds; covers cache hits (sub-millisecond) up to slow upstream pulls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class holding the name, help text and label names of a metric."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        # Unlabeled metrics are exposed as 0 before their first update
+        self.values: dict[tuple, float] = {} if self.labelnames else {(): 0.0}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, per label set."""
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels) -> None:
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets, per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self) -> list[str]:
+        lines = []
+        for labels, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Callback(Metric):
+    """Unlabeled counter or gauge whose value is read from ``fn`` at scrape time."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float], kind: str = "gauge"):
+        super().__init__(name, help)
+        self.kind = kind
+        self.fn = fn
+
+    def samples(self) -> list[str]:
+        return [f"{self.name} {_number(self.fn())}"]
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+requests_total = REGISTRY.register(Counter(
+    "experian_mcp_requests_total", "JSON-RPC requests handled, by method.", ("method",)))
+request_errors = REGISTRY.register(Counter(
+    "experian_mcp_request_errors_total", "JSON-RPC error responses, by method and error code.", ("method", "code")))
+request_duration = REGISTRY.register(Histogram(
+    "experian_mcp_request_duration_seconds", "JSON-RPC request handling time, by method.", ("method",)))
+inflight_requests = REGISTRY.register(Gauge(
+    "experian_mcp_inflight_requests", "JSON-RPC requests currently being handled."))
+response_bytes = REGISTRY.register(Counter(
+    "experian_mcp_response_bytes_total", "Bytes of /mcp response bodies before and after compression, by encoding and stage.",
+    ("encoding", "stage")))
+
+tool_calls = REGISTRY.register(Counter(
+    "experian_mcp_tool_calls_total", "Tool calls, by tool and outcome (ok, error, exception).", ("tool", "outcome")))
+tool_duration = REGISTRY.register(Histogram(
+    "experian_mcp_tool_duration_seconds", "Tool execution time, by tool.", ("tool",)))
+
+upstream_requests = REGISTRY.register(Counter(
+    "experian_upstream_requests_total", "Responses from the Experian API, by path and HTTP status.", ("path", "status")))
+upstream_errors = REGISTRY.register(Counter(
+    "experian_upstream_errors_total", "Experian API calls that got no response, by path and error type.", ("path", "error")))
+upstream_duration = REGISTRY.register(Histogram(
+    "experian_upstream_duration_seconds", "Time until the Experian API response headers arrived, by path.", ("path",)))
+upstream_retries = REGISTRY.register(Counter(
+    "experian_upstream_retries_total", "Retried Experian API attempts, by call and reason.", ("call", "reason")))
+upstream_hedges = REGISTRY.register(Counter(
+    "experian_upstream_hedged_requests_total", "Hedged Experian API attempts sent after a slow one, by call.", ("call",)))
+circuit_rejections = REGISTRY.register(Counter(
+    "experian_upstream_circuit_rejections_total", "Calls failed fast while the circuit was open, by circuit.", ("circuit",)))
+
+admission_rejections = REGISTRY.register(Counter(
+    "experian_mcp_admission_rejections_total", "Operations rejected as overloaded, by operation and reason.",
+    ("operation", "reason")))
+admission_wait = REGISTRY.register(Histogram(
+    "experian_mcp_admission_wait_seconds", "Time spent waiting for an admission slot, by operation.", ("operation",)))
+rate_limit_wait = REGISTRY.register(Histogram(
+    "experian_upstream_rate_limit_wait_seconds", "Delay added to Experian API requests by the rate limiter."))
+
+
+def render() -> str:
+    """Return all registered metrics in the Prometheus text format."""
+    return REGISTRY.render()
@@ -0,0 +1,126 @@
+"""Progress notifications for long-running tool calls.
+
+A request that carries ``params._meta.progressToken`` is handled inside
+``reporting()``, which installs a reporter in a context variable. Code further
+down (the token fetch, the Experian round trip, the streaming report parser)
+calls ``report()`` as each phase completes; without a reporter these calls do
+nothing. Every report becomes one MCP ``notifications/progress`` message with
+a ``progress`` value that increases by one per phase and a short ``message``.
+
+A tool that can use parts of the report before the pull finishes installs a
+handler with ``partial_sections()``. It is called with each report section as
+soon as the parser has built it, and whatever it returns is sent along in the
+notification's ``partial`` field, e.g. the first page of ``tradeline``.
+
+A pull shared by concurrent calls for the same applicant runs in the context
+of the call that started it, so only that call receives its progress. Work
+run inside ``muted()`` reports nothing, so a batch can report one step per
+item instead of every phase of every item.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator
+
+SectionHandler = Callable[[str, Any], dict | None]
+
+
+class Reporter:
+    """Numbers the progress of one request and hands each update to ``send``.
+
+    Args:
+        send: Coroutine function called with the ``progress``, ``message`` and
+            any extra fields of a ``notifications/progress`` message; None to
+            discard the updates.
+    """
+
+    def __init__(self, send: Callable[[dict], Awaitable[None]] | None):
+        self.send = send
+        self.progress = 0
+
+    async def __call__(self, message: str, **fields) -> None:
+        if self.send is None:
+            return
+        self.progress += 1
+        try:
+            await self.send({"progress": self.progress, "message": message, **fields})
+        except Exception as e:
+            # Progress is best effort; a client that stopped listening must not fail the pull
+            logging.debug(f"Could not send progress notification: {e!r}")
+
+
+_reporter: ContextVar[Reporter | None] = ContextVar("progress_reporter", default=None)
+_section_handler: ContextVar[SectionHandler | None] = ContextVar("progress_section_handler", default=None)
+
+
+def current() -> Reporter | None:
+    """Return the reporter installed for the current request, if any."""
+    return _reporter.get()
+
+
+def enabled() -> bool:
+    """Whether progress reported now is sent anywhere."""
+    reporter = _reporter.get()
+    return reporter is not None and reporter.send is not None
+
+
+@contextmanager
+def reporting(send: Callable[[dict], Awaitable[None]]) -> Iterator[Reporter]:
+    """Send the progress reported within the block with ``send``."""
+    reporter = Reporter(send)
+    token = _reporter.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _reporter.reset(token)
+
+
+@contextmanager
+def muted() -> Iterator[None]:
+    """Discard the progress reported within the block."""
+    token = _reporter.set(Reporter(None))
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
+
+
+@contextmanager
+def partial_sections(handler: SectionHandler) -> Iterator[None]:
+    """Pass each report section parsed within the block to ``handler``.
+
+    Args:
+        handler: Called with a section name and value; returns the partial
+            result to send with the progress notification, or None to send none.
+    """
+    token = _section_handler.set(handler)
+    try:
+        yield
+    finally:
+        _section_handler.reset(token)
+
+
+async def report(message: str, **fields) -> None:
+    """Report that a phase of the current request has completed.
+
+    Args:
+        message (str): What has been done.
+        **fields: Further ``notifications/progress`` params, e.g. ``total``.
+    """
+    reporter = _reporter.get()
+    if reporter is not None:
+        await reporter(message, **fields)
+
+
+async def section(name: str, value: Any) -> None:
+    """Report that the report section ``name`` has been parsed, with its partial result if any."""
+    if not enabled():
+        return
+    reporter = _reporter.get()
+    handler = _section_handler.get()
+    partial = handler(name, value) if handler is not None else None
+    if partial is None:
+        await reporter(f"Parsed {name}")
+    else:
+        await reporter(f"Parsed {name}", partial=partial)
@@ -0,0 +1,169 @@
+"""Extraction of sections from an Experian credit report response.
+
+A full credit report is a large JSON document (the sample ``output.json`` is
+about 180 KB, mostly ``publicRecord``, ``tradeline`` and
+``covidSpotlightAttributes`` arrays) of which the tools need only some
+sections of the first ``creditProfile``. ``ProfileParser`` is fed the response
+body chunk by chunk as it arrives and returns those sections as a typed
+``CreditProfile``.
+
+By default the body is buffered and decoded in one pass by the schema-driven
+decoder of ``credit_profile``, which skips the sections it does not need
+without building them and is several times faster than parsing event by
+event. A parser created with ``stream=True`` instead builds each section as
+soon as its end arrives, so progress notifications can pass sections on
+before the whole report is in, and reports when all of them have been seen so
+the caller can stop parsing. A body larger than ``EXPERIAN_STREAM_PARSE_BYTES``
+(default 1 MiB) is streamed as well once that much has been buffered, so the
+memory a pull holds stops growing with the size of the raw report; streaming
+takes several times the CPU of the one-pass decode
+(``uv run testing/bench_report_parser.py`` measures both). Streaming uses
+``ijson`` when installed (``pip install ijson`` or the ``fast`` extra);
+without it every body is buffered.
+"""
+
+import os
+
+import credit_profile
+from credit_profile import CreditProfile
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Sections of creditProfile[0] used by credit_score
+SUMMARY_SECTIONS = ("headerRecord", "consumerIdentity", "riskModel", "ssn")
+
+# Sections kept from each pull and served by credit_report_sections;
+# covidSpotlightAttributes and the remaining bookkeeping sections are skipped.
+REPORT_SECTIONS = SUMMARY_SECTIONS + (
+    "addressInformation", "inquiry", "publicRecord", "summaries", "tradeline"
+)
+
+PROFILE_PREFIX = "creditProfile.item"
+
+# Bytes of a body buffered for the one-pass decode before the rest is streamed instead
+STREAM_PARSE_BYTES = int(os.getenv("EXPERIAN_STREAM_PARSE_BYTES", str(1024 * 1024)))
+
+
+class ReportParseError(Exception):
+    """Raised when the credit report response is not valid JSON or does not match the schema."""
+
+
+class ProfileParser:
+    """Push parser extracting top-level sections of the first credit profile.
+
+    Args:
+        sections: Names of the ``creditProfile[0]`` keys to extract; any of REPORT_SECTIONS.
+        stream (bool): Build each section as soon as it has arrived, see the module docstring.
+        stream_above (int): Bytes buffered before switching to streaming.
+    """
+
+    def __init__(self, sections=SUMMARY_SECTIONS, stream: bool = False, stream_above: float = STREAM_PARSE_BYTES):
+        self.sections = frozenset(sections)
+        # Sections parsed so far by name, in the order they were completed
+        self.parsed: dict = {}
+        self.done = False
+        self.stream_above = stream_above
+        self.streaming = False
+        self._chunks: list[bytes] = []
+        self._buffered = 0
+        if stream and ijson is not None:
+            self._start_streaming()
+
+    def _start_streaming(self) -> None:
+        self.streaming = True
+        self._events = ijson.sendable_list()
+        self._coro = ijson.parse_coro(self._events)
+        self._builder = None
+        self._section = None
+        self._depth = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse the next chunk of the body.
+        Returns:
+            bool: True once every requested section (or the whole first
+            profile) has been parsed; further chunks can be discarded.
+        Raises:
+            ReportParseError: If the body is not valid JSON or a section does not match the schema.
+        """
+        if self.done:
+            return True
+        if self.streaming:
+            self._stream(chunk)
+            return self.done
+        self._chunks.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered <= self.stream_above or ijson is None:
+            return False
+        # A large report: parse the chunks buffered so far, releasing each
+        # once parsed, and stream the rest
+        chunks = self._chunks
+        self._chunks = []
+        chunks.reverse()
+        self._start_streaming()
+        while chunks and not self.done:
+            self._stream(chunks.pop())
+        return self.done
+
+    def _stream(self, chunk: bytes) -> None:
+        try:
+            self._coro.send(chunk)
+        except ijson.JSONError as e:
+            raise ReportParseError(f"Invalid credit report JSON: {e}") from e
+        self._process_events()
+
+    def close(self) -> CreditProfile:
+        """Finish parsing and return the extracted sections.
+        Raises:
+            ReportParseError: If the body is not valid JSON or does not match the schema.
+        """
+        if not self.streaming:
+            if not self.done:
+                try:
+                    profile = credit_profile.decode_report(b"".join(self._chunks))
+                except credit_profile.DecodeError as e:
+                    raise ReportParseError(f"Invalid credit report: {e}") from e
+                self._chunks = []
+                self.parsed = {
+                    name: value for name, value in profile.sections().items() if name in self.sections
+                }
+                self.done = True
+        elif not self.done:
+            try:
+                self._coro.close()
+            except ijson.JSONError as e:
+                raise ReportParseError(f"Invalid credit report JSON: {e}") from e
+            self._process_events()
+            self.done = True
+        return CreditProfile(**self.parsed)
+
+    def _process_events(self) -> None:
+        for prefix, event, value in self._events:
+            if self._builder is not None:
+                # Inside a requested section: build it until its value is complete
+                self._builder.event(event, value)
+                if event == "start_map" or event == "start_array":
+                    self._depth += 1
+                elif event == "end_map" or event == "end_array":
+                    self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        self.parsed[self._section] = credit_profile.decode_section(self._section, self._builder.value)
+                    except credit_profile.DecodeError as e:
+                        raise ReportParseError(f"Invalid credit report: {e}") from e
+                    self._builder = None
+                    if len(self.parsed) == len(self.sections):
+                        self.done = True
+                        break
+            elif prefix == PROFILE_PREFIX:
+                if event == "map_key" and value in self.sections:
+                    self._section = value
+                    self._builder = ijson.ObjectBuilder()
+                    self._depth = 0
+                elif event == "end_map":
+                    # End of the first profile; later profiles are ignored
+                    self.done = True
+                    break
+        del self._events[:]
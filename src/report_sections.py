@@ -0,0 +1,133 @@
+"""Field projection and cursor pagination over credit report sections.
+
+``select_sections`` cuts a cached ``CreditProfile`` down to what a caller
+asked for, as plain dicts and lists: a subset of sections, optionally only
+some fields of each item, and at most ``limit`` items of each array section
+per page. The returned ``next_cursor`` is an opaque string holding the offset
+reached in every array section that has more items; passing it back returns
+the next page of just those sections, so a caller can walk ``publicRecord`` or
+``tradeline`` without ever receiving the whole report in one response.
+"""
+
+import base64
+import json
+
+from credit_profile import CreditProfile, to_builtins
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class SelectionError(ValueError):
+    """Raised for an unknown section or field selector, or a malformed cursor."""
+
+
+def encode_cursor(offsets: dict[str, int]) -> str:
+    """Encode per-section offsets as an opaque cursor string."""
+    raw = json.dumps(offsets, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, int]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        SelectionError: If the cursor is not a valid cursor string.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        offsets = json.loads(raw)
+    except ValueError as e:
+        raise SelectionError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(offsets, dict) or not all(
+        isinstance(offset, int) and offset >= 0 for offset in offsets.values()
+    ):
+        raise SelectionError(f"Invalid cursor: {cursor!r}")
+    return offsets
+
+
+def parse_fields(fields: list[str] | None, sections: list[str]) -> dict[str, set[str]]:
+    """Group ``section.field`` selectors by section.
+
+    Raises:
+        SelectionError: If a selector is not of the form ``section.field`` or
+            names a section that is not selected.
+    """
+    by_section: dict[str, set[str]] = {}
+    for selector in fields or ():
+        section, _, field = selector.partition(".")
+        if not field:
+            raise SelectionError(f"Field selector must be 'section.field', got {selector!r}")
+        if section not in sections:
+            raise SelectionError(f"Field selector {selector!r} names a section that is not selected")
+        by_section.setdefault(section, set()).add(field)
+    return by_section
+
+
+def _project(value, fields: set[str] | None):
+    value = to_builtins(value)
+    if fields is None or not isinstance(value, dict):
+        return value
+    return {key: item for key, item in value.items() if key in fields}
+
+
+def select_sections(
+    profile: CreditProfile,
+    available: tuple[str, ...],
+    sections: list[str] | None = None,
+    fields: list[str] | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> dict:
+    """Return one page of the selected sections of a credit profile.
+
+    Args:
+        profile (CreditProfile): Sections of ``creditProfile[0]``.
+        available (tuple[str, ...]): Section names callers may select.
+        sections (list[str], optional): Sections to return (default: all available).
+        fields (list[str], optional): ``section.field`` selectors; a section
+            with selectors returns only those fields of each item.
+        cursor (str, optional): ``next_cursor`` of the previous page. Only
+            array sections with remaining items are returned.
+        limit (int): Maximum items per array section, capped at MAX_PAGE_SIZE.
+    Returns:
+        dict: ``sections`` with the page content, ``totals`` with the full
+        length of each returned array section, and ``next_cursor`` (None on
+        the last page).
+    Raises:
+        SelectionError: If a section, field selector or cursor is invalid.
+    """
+    selected = list(sections) if sections else list(available)
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise SelectionError(f"Unknown section(s) {unknown}; available: {list(available)}")
+    projections = parse_fields(fields, selected)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    offsets = None
+    if cursor:
+        offsets = decode_cursor(cursor)
+        selected = [name for name in selected if name in offsets]
+
+    page: dict = {}
+    totals: dict[str, int] = {}
+    next_offsets: dict[str, int] = {}
+    for name in selected:
+        value = getattr(profile, name)
+        section_fields = projections.get(name)
+        if not isinstance(value, list):
+            if value is not None:
+                page[name] = _project(value, section_fields)
+            continue
+        start = offsets[name] if offsets else 0
+        end = start + limit
+        page[name] = [_project(item, section_fields) for item in value[start:end]]
+        totals[name] = len(value)
+        if end < len(value):
+            next_offsets[name] = end
+
+    return {
+        "sections": page,
+        "totals": totals,
+        "next_cursor": encode_cursor(next_offsets) if next_offsets else None
+    }
@@ -0,0 +1,118 @@
+"""Pre-parsed Experian credit report request template.
+
+The template JSON (``data/income_employment.json`` by default) is parsed once
+and split into the static part of the request and the primary applicant
+record. Each call to ``build()`` only creates the few small dicts that differ
+per applicant and shares everything else, so building a request body does no
+file I/O and no deep copies. The file's mtime is checked at most every
+``check_interval`` seconds and the template is reloaded when it changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+
+DEFAULT_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "data", "income_employment.json"
+)
+CHECK_INTERVAL = float(os.getenv("EXPERIAN_TEMPLATE_CHECK_INTERVAL", "5"))
+
+
+def normalize_ssn(ssn: str) -> str:
+    """Strip separators from an SSN and check it has nine digits.
+    Raises:
+        ValueError: If the SSN does not contain exactly nine digits.
+    """
+    digits = "".join(ch for ch in str(ssn) if ch.isdigit())
+    if len(digits) != 9:
+        raise ValueError(f"SSN must contain 9 digits, got {len(digits)}")
+    return digits
+
+
+class RequestTemplate:
+    """Credit report request template loaded once and reloaded on change.
+
+    ``fingerprint`` is a hash of the current template file, so results derived
+    from it can be keyed by template version.
+
+    Args:
+        path (str): Path to the JSON request template.
+        check_interval (float): Minimum seconds between mtime checks.
+    """
+
+    def __init__(self, path: str = DEFAULT_TEMPLATE_PATH, check_interval: float = CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._mtime = None
+        self._next_check = 0.0
+        self._base: dict = {}
+        self._pii: dict = {}
+        self._applicant: dict = {}
+        self.fingerprint = ""
+        self._reload_if_changed()
+
+    def _reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        template = json.loads(raw)
+        self.fingerprint = hashlib.sha256(raw).hexdigest()
+
+        self._pii = template.get("consumerPii", {})
+        self._applicant = self._pii.get("primaryApplicant", {})
+        self._base = {key: value for key, value in template.items() if key != "consumerPii"}
+        if self._mtime is not None:
+            logging.info(f"Reloaded credit report request template {self.path}")
+        self._mtime = mtime
+
+    def build(
+        self,
+        ssn: str,
+        first_name: str | None = None,
+        middle_name: str | None = None,
+        last_name: str | None = None,
+        dob: str | None = None,
+        address_line1: str | None = None,
+        city: str | None = None,
+        state: str | None = None,
+        zip_code: str | None = None,
+    ) -> dict:
+        """Materialize a request body for one applicant.
+
+        Name and address are replaced as a whole when any of their fields is
+        given; otherwise the template values are kept.
+        Returns:
+            dict: Request body. Nested template values are shared between
+            calls and must not be mutated.
+        """
+        self._reload_if_changed()
+
+        applicant = dict(self._applicant)
+        applicant["ssn"] = {"ssn": normalize_ssn(ssn)}
+        if first_name or middle_name or last_name:
+            name = {"lastName": last_name or "", "firstName": first_name or ""}
+            if middle_name:
+                name["middleName"] = middle_name
+            applicant["name"] = name
+        if dob:
+            applicant["dob"] = {"dob": dob}
+        if address_line1 or city or state or zip_code:
+            applicant["currentAddress"] = {
+                "line1": address_line1 or "",
+                "city": city or "",
+                "state": state or "",
+                "zipCode": zip_code or "",
+            }
+
+        body = dict(self._base)
+        body["consumerPii"] = {**self._pii, "primaryApplicant": applicant}
+        return body
@@ -0,0 +1,313 @@
+"""Retries, circuit breaking and request hedging for calls to the Experian API.
+
+``Resilience.call`` runs one upstream attempt at a time and layers on:
+
+* a timeout for the whole attempt (httpx timeouts only bound each read);
+* retries of transport errors, timeouts and 429/5xx responses with jittered
+  exponential backoff, honouring ``Retry-After``, unless the backoff would
+  outlast the request's deadline;
+* a circuit breaker that, after consecutive failures, fails calls immediately
+  for a cool-down period and then lets a single probe through; only responses
+  from the API close it, and errors raised before any response (e.g. no access
+  token) count neither way;
+* optional hedging: when an attempt is slower than a percentile of recent
+  attempts, a second one is started and whichever succeeds first wins;
+* optional pacing by a ``RateLimiter``, waited for before each attempt (hedges
+  included) so that local queueing never counts against the attempt timeout,
+  the latency samples or the circuit breaker. Only the request's deadline
+  bounds the wait.
+
+Credit report and token requests are reads, so repeating them is safe.
+Settings are read from the environment:
+
+    EXPERIAN_RETRY_ATTEMPTS      attempts per call, including the first (default 3)
+    EXPERIAN_RETRY_BACKOFF       base backoff in seconds, doubled per retry (default 0.2)
+    EXPERIAN_RETRY_MAX_BACKOFF   longest backoff or Retry-After waited for (default 5)
+    EXPERIAN_ATTEMPT_TIMEOUT     seconds an attempt may take; 0 disables (default 30)
+    EXPERIAN_BREAKER_FAILURES    consecutive failures that open the circuit; 0 disables (default 5)
+    EXPERIAN_BREAKER_RESET       seconds the circuit stays open before a probe (default 30)
+    EXPERIAN_HEDGE_PERCENTILE    latency percentile after which to hedge, e.g. 95; 0 disables (default 0)
+    EXPERIAN_HEDGE_MIN_SAMPLES   attempts observed before hedging starts (default 20)
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+import deadlines
+import metrics
+from admission import RateLimiter
+
+RETRY_ATTEMPTS = max(1, int(os.getenv("EXPERIAN_RETRY_ATTEMPTS", "3")))
+RETRY_BACKOFF = float(os.getenv("EXPERIAN_RETRY_BACKOFF", "0.2"))
+RETRY_MAX_BACKOFF = float(os.getenv("EXPERIAN_RETRY_MAX_BACKOFF", "5"))
+ATTEMPT_TIMEOUT = float(os.getenv("EXPERIAN_ATTEMPT_TIMEOUT", "30"))
+BREAKER_FAILURES = int(os.getenv("EXPERIAN_BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("EXPERIAN_BREAKER_RESET", "30"))
+HEDGE_PERCENTILE = float(os.getenv("EXPERIAN_HEDGE_PERCENTILE", "0"))
+HEDGE_MIN_SAMPLES = int(os.getenv("EXPERIAN_HEDGE_MIN_SAMPLES", "20"))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream API while the circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} is temporarily unavailable; retry in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed attempt may succeed if repeated."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Whether an error means the upstream service is unhealthy, as opposed to a bad request."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds from the ``Retry-After`` header of an HTTP error response, if any."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    try:
+        return max(0.0, float(error.response.headers.get("retry-after", "")))
+    except ValueError:
+        return None
+
+
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive upstream failures.
+
+    While open, ``check()`` raises ``CircuitOpenError`` for ``reset_timeout``
+    seconds. Then the circuit is half-open: one call is let through as a probe
+    and closes the circuit if it succeeds or reopens it if it fails.
+
+    Args:
+        name (str): Name of the protected service, used in errors and logs.
+        failure_threshold (int): Consecutive failures that open the circuit; 0 disables it.
+        reset_timeout (float): Seconds the circuit stays open.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURES, reset_timeout: float = BREAKER_RESET):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def check(self) -> None:
+        """Raise CircuitOpenError unless a call may go ahead."""
+        if self.state == self.CLOSED:
+            return
+        retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+        if self.state == self.OPEN and retry_in <= 0:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        metrics.circuit_rejections.inc(self.name)
+        raise CircuitOpenError(self.name, max(retry_in, 0.0))
+
+    def release(self) -> None:
+        """Give back the probe slot of a call that ended without a result, e.g. was cancelled."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logging.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.failure_threshold and (self.state == self.HALF_OPEN or self.failures >= self.failure_threshold):
+            if self.state != self.OPEN:
+                logging.warning(
+                    f"Circuit for {self.name} opened after {self.failures} failures; "
+                    f"failing fast for {self.reset_timeout:.0f}s"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Durations of the most recent successful attempts, for hedging thresholds."""
+
+    def __init__(self, window: int = 200):
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+class Resilience:
+    """Runs upstream attempts with a timeout, retries, a circuit breaker and hedging.
+
+    Args:
+        name (str): Name of the upstream call, used in metrics, errors and logs.
+        attempts (int): Attempts per call, including the first.
+        backoff (float): Base backoff in seconds; retry ``n`` waits a random
+            time up to ``backoff * 2 ** (n - 1)`` ("full jitter").
+        max_backoff (float): Cap on the backoff. A ``Retry-After`` longer than
+            this ends the call instead of waiting.
+        attempt_timeout (float): Seconds an attempt may take; 0 disables.
+        breaker (CircuitBreaker, optional): Circuit breaker (default: from the environment).
+        hedge_percentile (float): Hedge attempts slower than this percentile
+            of recent ones; 0 disables hedging.
+        hedge_min_samples (int): Attempts observed before hedging starts.
+        rate_limiter (RateLimiter, optional): Paces the attempts sent upstream.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        attempts: int = RETRY_ATTEMPTS,
+        backoff: float = RETRY_BACKOFF,
+        max_backoff: float = RETRY_MAX_BACKOFF,
+        attempt_timeout: float = ATTEMPT_TIMEOUT,
+        breaker: CircuitBreaker | None = None,
+        hedge_percentile: float = HEDGE_PERCENTILE,
+        hedge_min_samples: int = HEDGE_MIN_SAMPLES,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.name = name
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.attempt_timeout = attempt_timeout
+        self.breaker = breaker or CircuitBreaker(name)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latencies = LatencyTracker()
+        self.rate_limiter = rate_limiter
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of the first successful ``fn()`` attempt.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+            Exception: The error of the last attempt if every attempt failed
+                or the error is not retryable.
+        """
+        for attempt in range(1, self.attempts + 1):
+            self.breaker.check()
+            try:
+                await self._pace()
+            except BaseException:
+                # Cancelled (e.g. at the request deadline) while waiting locally
+                self.breaker.release()
+                raise
+            try:
+                result = await self._attempt(fn)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                if is_upstream_failure(e):
+                    self.breaker.record_failure()
+                elif isinstance(e, httpx.HTTPStatusError):
+                    # Experian answered, if only to reject the request, so it is up
+                    self.breaker.record_success()
+                else:
+                    # No response from Experian to judge by: a token that could not be
+                    # obtained, a nested call failed fast, a report that did not parse
+                    self.breaker.release()
+                delay = self._backoff(attempt, e)
+                remaining = deadlines.remaining()
+                if attempt == self.attempts or delay is None or (remaining is not None and delay >= remaining):
+                    raise
+                reason = str(e.response.status_code) if isinstance(e, httpx.HTTPStatusError) else type(e).__name__
+                metrics.upstream_retries.inc(self.name, reason)
+                logging.warning(
+                    f"{self.name} attempt {attempt}/{self.attempts} failed ({e!r}); retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
+
+    def _backoff(self, attempt: int, error: Exception) -> float | None:
+        """Seconds to wait before the next attempt, or None if ``error`` must not be retried."""
+        if not is_retryable(error):
+            return None
+        requested = retry_after(error)
+        if requested is not None:
+            return requested if requested <= self.max_backoff else None
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def hedge_delay(self) -> float | None:
+        """Seconds after which to hedge an attempt, or None if hedging is off for now."""
+        if (
+            self.hedge_percentile <= 0
+            or len(self.latencies.samples) < self.hedge_min_samples
+            or self.breaker.state != CircuitBreaker.CLOSED
+        ):
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    async def _pace(self) -> None:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+    async def _paced(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        await self._pace()
+        return await self._timed(fn)
+
+    async def _timed(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.perf_counter()
+        if self.attempt_timeout > 0:
+            async with asyncio.timeout(self.attempt_timeout):
+                result = await fn()
+        else:
+            result = await fn()
+        self.latencies.observe(time.perf_counter() - start)
+        return result
+
+    async def _attempt(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._timed(fn)
+
+        loop = asyncio.get_running_loop()
+        pending = {loop.create_task(self._timed(fn))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                metrics.upstream_hedges.inc(self.name)
+                logging.debug(f"{self.name} attempt slower than {delay * 1e3:.0f} ms; sending a hedged request")
+                pending.add(loop.create_task(self._paced(fn)))
+            error = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
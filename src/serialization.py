@@ -0,0 +1,54 @@
+"""Compact JSON encoding for MCP responses.
+
+Tool results and JSON-RPC envelopes are encoded once, without indentation or
+separator whitespace. ``orjson`` is used when installed (``pip install orjson``
+or the ``fast`` extra); the standard library encoder is the fallback.
+
+    EXPERIAN_JSON_ENCODER        "orjson" or "json" (default: orjson if installed)
+    EXPERIAN_STRUCTURED_CONTENT  also return tool results as structuredContent (default 0)
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_ENCODER = os.getenv("EXPERIAN_JSON_ENCODER", "orjson" if orjson else "json")
+STRUCTURED_CONTENT = os.getenv("EXPERIAN_STRUCTURED_CONTENT", "0").lower() in ("1", "true", "yes")
+
+if JSON_ENCODER == "orjson" and orjson is None:
+    raise ImportError("EXPERIAN_JSON_ENCODER=orjson but orjson is not installed")
+
+
+if JSON_ENCODER == "orjson":
+    def dumps(obj) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(obj) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+        return _encoder.encode(obj).encode()
+
+
+def tool_result(result) -> dict:
+    """Build a ``tools/call`` result carrying ``result`` as compact JSON text.
+
+    When structured content is enabled the same object is also returned
+    unencoded as ``structuredContent``.
+    """
+    content = {
+        "content": [
+            {
+                "type": "text",
+                "text": dumps(result).decode()
+            }
+        ]
+    }
+    if STRUCTURED_CONTENT and isinstance(result, dict):
+        content["structuredContent"] = result
+    return content
@@ -1,10 +1,17 @@
+import time
+
+# Import and startup times are reported from here
+STARTED_AT = time.perf_counter()
+
 import logging
 import os
-import sys
-import requests
 import json
+import asyncio
 import argparse
 import anyio
+import httpx
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncIterator, Awaitable, Callable
 
 # Logging setup 
 # Configure logging to display the time, file name and line number.
@@ -14,6 +21,26 @@ logging.basicConfig(
 )
 
 from mcp.server.fastmcp import FastMCP
+import mcp.types as types
+
+import compression
+import credit_profile
+import deadlines
+import metrics
+import progress
+import sessions
+import tracing
+import upstream
+from token_manager import TokenManager, TokenUnavailableError
+from resilience import CircuitBreaker, CircuitOpenError, Resilience
+from admission import AdmissionQueue, OverloadedError, RateLimiter
+from request_template import DEFAULT_TEMPLATE_PATH, RequestTemplate
+from cache import ResultCache
+from credit_profile import CreditProfile, Dob
+from singleflight import SingleFlight
+from serialization import dumps, tool_result
+from report_parser import REPORT_SECTIONS, ProfileParser, ReportParseError
+from report_sections import DEFAULT_PAGE_SIZE, SelectionError, select_sections
 
 # --- Credentials ---
 USERNAME = os.getenv("EXPERIAN_USERNAME")
@@ -25,30 +52,69 @@ if USERNAME == None or PASSWORD == None or CLIENT_ID == None or CLIENT_SECRET ==
     logging.error("Experian USERNAME, PASSWORD, CLIENT_ID or CLIENT_SECRET not set in environment variables. Exiting.")
     exit(1)
 
-sys.path.insert(0, '/workspaces/experian')
+# Experian sandbox by default; point at testing/mock_experian.py for offline testing
+BASE_URL = os.getenv("EXPERIAN_BASE_URL", "https://sandbox-us-api.experian.com").rstrip("/")
+TOKEN_URL = f"{BASE_URL}/oauth2/v1/token"
+CREDIT_REPORT_URL = f"{BASE_URL}/consumerservices/credit-profile/v2/credit-report"
 
-TOKEN_URL = "https://sandbox-us-api.experian.com/oauth2/v1/token"  # Sandbox URL
+# Fetch the access token before serving instead of on the first credit pull
+WARM_UP = os.getenv("EXPERIAN_WARM_UP", "0").lower() in ("1", "true", "yes")
+
+@asynccontextmanager
+async def server_lifespan(server):
+    """Warm up before the stdio transport serves and close pooled upstream connections afterwards."""
+    await warm_up()
+    log_startup_time()
+    try:
+        yield
+    finally:
+        await upstream.aclose()
+
+tracing.configure("experian-mcp-server")
 
 # Create an MCP server
-mcp = FastMCP("Experian MCP Server v0.1")
+mcp = FastMCP("Experian MCP Server v0.1", lifespan=server_lifespan)
 
-def build_credit_report_request() -> dict:
-    """Build request body matching Experian Credit Profile v2 schema.
-    Fields intentionally minimal for sandbox; adjust as needed.
-    """
+request_template = RequestTemplate(
+    os.getenv("EXPERIAN_REQUEST_TEMPLATE", DEFAULT_TEMPLATE_PATH)
+)
 
-    # requestor = {}
-    # if SUBSCRIBER_CODE:
-    #     requestor["subscriberCode"] = SUBSCRIBER_CODE
-    # if COMPANY_ID:
-    #     requestor["companyId"] = COMPANY_ID
+result_cache = ResultCache(
+    db_path=os.getenv("EXPERIAN_CACHE_DB"),
+    salt=os.getenv("EXPERIAN_CACHE_SALT"),
+    encode=credit_profile.encode,
+    decode=credit_profile.decode,
+)
 
-    body = json.load(open("data/income_employment.json"))
+BATCH_CONCURRENCY = int(os.getenv("EXPERIAN_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("EXPERIAN_BATCH_MAX_CONCURRENCY", "32"))
+BATCH_MAX_SIZE = int(os.getenv("EXPERIAN_BATCH_MAX_SIZE", "10000"))
+# Seconds of a batch's deadline kept back to build and send the partial results
+BATCH_DEADLINE_RESERVE = 0.1
 
-    return body
+# Concurrent credit_score calls for the same applicant share one upstream pull.
+inflight_pulls = SingleFlight()
+
+# Sessions of HTTP clients, each with its negotiated state and a small profile cache
+http_sessions = sessions.SessionStore()
+
+def build_credit_report_request(ssn: str, **applicant) -> dict:
+    """Build request body matching Experian Credit Profile v2 schema.
+    Fields intentionally minimal for sandbox; adjust as needed.
+    Args:
+        ssn (str): Social Security Number of the applicant.
+        **applicant: Optional name, date of birth and address overrides,
+            see ``RequestTemplate.build``.
+    Returns:
+        dict: Request body for the credit report endpoint.
+    """
+    return request_template.build(ssn, **applicant)
 
-def get_access_token() -> str | None:
-    """Obtain OAuth2 token using ROPC flow as required by Experian sandbox."""
+async def get_access_token() -> dict | None:
+    """Obtain OAuth2 token using ROPC flow as required by Experian sandbox.
+    Returns:
+        dict | None: Token response with ``access_token`` and ``expires_in``, or None on failure.
+    """
     headers = {
         "Accept": "application/json",
         "Content-Type": "application/x-www-form-urlencoded",
@@ -61,114 +127,581 @@ def get_access_token() -> str | None:
         "client_secret": CLIENT_SECRET,
     }
 
-    try:
-        logging.debug(f"Token request headers: {headers}")
-        resp = requests.post(TOKEN_URL, data=payload, headers=headers)
+    async def post_token() -> dict:
+        with tracing.span("experian.token", kind="client") as span:
+            resp = await upstream.get_client().post(TOKEN_URL, data=payload, headers=headers)
+            span.set("http.status_code", resp.status_code)
         logging.debug(f"Token response: {resp.status_code} {resp.text}")
         resp.raise_for_status()
-        return resp.json().get("access_token")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error obtaining token: {e}")
-        if hasattr(e, "response") and getattr(e, "response") is not None:
+        return resp.json()
+
+    try:
+        logging.debug(f"Token request headers: {headers}")
+        return await token_calls.call(post_token)
+    except (httpx.HTTPError, TimeoutError, CircuitOpenError) as e:
+        logging.error(f"Error obtaining token: {e!r}")
+        if isinstance(e, httpx.HTTPStatusError):
             logging.error(f"Token error details: {e.response.text}")
         return None
 
-access_token = get_access_token()
-if not access_token:
-    logging.error("Cannot make API request without an access token.")
-    exit(1)
+tokens = TokenManager(get_access_token, cache_path=os.getenv("EXPERIAN_TOKEN_CACHE"))
+
+# Bounded concurrency and queue for pulls that miss the cache, and pacing of the
+# requests (including retries and hedges) sent to Experian
+pull_admission = AdmissionQueue("credit_pull")
+credit_report_rate_limit = RateLimiter()
+
+# Token and credit report calls share one breaker: both fail when Experian is down
+experian_breaker = CircuitBreaker("Experian API")
+token_calls = Resilience("token", breaker=experian_breaker, hedge_percentile=0)
+credit_report_calls = Resilience("credit_report", breaker=experian_breaker, rate_limiter=credit_report_rate_limit)
+
+def cache_hit_ratio() -> float:
+    """Share of result cache lookups served from memory or disk."""
+    hits = result_cache.hits + result_cache.disk_hits
+    lookups = hits + result_cache.misses
+    return hits / lookups if lookups else 0.0
+
+_callback_metrics_registered = False
+
+def register_callback_metrics() -> None:
+    """Expose values other components already count, read when /metrics is scraped.
+
+    Registered once per process from ``create_app()`` rather than on import:
+    uvicorn workers import this file twice (as ``__mp_main__`` and as ``server``
+    for ``server:create_app``), and only the copy serving requests may register.
+    """
+    global _callback_metrics_registered
+    if _callback_metrics_registered:
+        return
+    _callback_metrics_registered = True
+    for metric in (
+        metrics.Callback("experian_token_refreshes_total", "Access tokens obtained from Experian by this process.",
+                         lambda: tokens.refresh_count, "counter"),
+        metrics.Callback("experian_mcp_cache_hits_total", "Result cache hits in memory.",
+                         lambda: result_cache.hits, "counter"),
+        metrics.Callback("experian_mcp_cache_disk_hits_total", "Result cache hits in the SQLite tier.",
+                         lambda: result_cache.disk_hits, "counter"),
+        metrics.Callback("experian_mcp_cache_misses_total", "Result cache misses.",
+                         lambda: result_cache.misses, "counter"),
+        metrics.Callback("experian_mcp_cache_evictions_total", "Entries evicted from the in-memory result cache.",
+                         lambda: result_cache.memory.evictions, "counter"),
+        metrics.Callback("experian_mcp_cache_hit_ratio", "Share of result cache lookups that hit.", cache_hit_ratio),
+        metrics.Callback("experian_mcp_cache_entries", "Entries in the in-memory result cache.",
+                         lambda: len(result_cache.memory)),
+        metrics.Callback("experian_mcp_cache_size_bytes", "Size of the in-memory result cache.",
+                         lambda: result_cache.memory.size_bytes),
+        metrics.Callback("experian_inflight_pulls", "Distinct credit report pulls in flight to Experian.",
+                         lambda: len(inflight_pulls)),
+        metrics.Callback("experian_upstream_circuit_open", "1 while the Experian API circuit breaker fails calls fast.",
+                         lambda: float(experian_breaker.state == CircuitBreaker.OPEN)),
+        metrics.Callback("experian_mcp_admission_active", "Credit pulls holding an admission slot.",
+                         lambda: pull_admission.active),
+        metrics.Callback("experian_mcp_admission_queued", "Credit pulls waiting for an admission slot.",
+                         lambda: pull_admission.queued),
+        metrics.Callback("experian_coalesced_pulls_total", "Credit report requests that joined a pull already in flight.",
+                         lambda: inflight_pulls.shared, "counter"),
+        metrics.Callback("experian_abandoned_pulls_total", "Credit report pulls cancelled because every caller gave up.",
+                         lambda: inflight_pulls.abandoned, "counter"),
+        metrics.Callback("experian_mcp_sessions", "Open MCP sessions on the HTTP transport.",
+                         lambda: len(http_sessions)),
+        metrics.Callback("experian_mcp_sessions_created_total", "MCP sessions started on the HTTP transport.",
+                         lambda: http_sessions.created, "counter"),
+        metrics.Callback("experian_mcp_sessions_expired_total", "MCP sessions dropped for being idle or least recently used.",
+                         lambda: http_sessions.expired, "counter"),
+    ):
+        metrics.REGISTRY.register(metric)
+
+async def warm_up() -> None:
+    """Fetch the access token ahead of the first request if warm-up is enabled.
+    Raises:
+        TokenUnavailableError: If warm-up is enabled and no token can be obtained.
+    """
+    if not WARM_UP:
+        return
+    try:
+        await tokens.get_token()
+    except TokenUnavailableError:
+        logging.error("Warm-up failed: cannot make API requests without an access token.")
+        raise
+
+def log_startup_time() -> None:
+    """Log how long the server took from import to being ready to serve."""
+    logging.info(
+        f"Server ready in {(time.perf_counter() - STARTED_AT) * 1e3:.0f} ms "
+        f"(imports and setup {IMPORT_SECONDS * 1e3:.0f} ms)"
+    )
+
+def reported_ssn(profile: CreditProfile, ssn: str) -> str:
+    """Return the SSN as Experian reports it, or ``ssn`` (the one requested) if the report has none."""
+    return (profile.ssn[0].number or ssn) if profile.ssn else ssn
+
+def extract_credit_score_info(profile: CreditProfile, ssn: str) -> dict:
+    """Extract the credit score summary from an Experian credit profile.
+    Args:
+        profile (CreditProfile): Sections of ``creditProfile[0]`` from the credit report response.
+        ssn (str): SSN used for the request, returned if the report has none.
+    Returns:
+        dict: Consumer name, date of birth, report date and risk model score.
+    """
+    identity = profile.identity
+    name = identity.primary_name
+    dob = identity.dob or Dob()
+    header = profile.header
+
+    # The risk model carries the credit score
+    risk_model = profile.risk_model
+    score_info = {}
+    if risk_model is not None:
+        score_info = {
+            "score": int(risk_model.score or "0"),
+            "model_indicator": risk_model.modelIndicator or "",
+            "evaluation": risk_model.evaluation or "",
+            "score_factors": [
+                {
+                    "code": factor.code or "",
+                    "importance": factor.importance or ""
+                }
+                for factor in risk_model.scoreFactors
+            ]
+        }
+
+    return {
+        "ssn": reported_ssn(profile, ssn),
+        "consumer_name": {
+            "first_name": name.firstName or "",
+            "middle_name": name.middleName or "",
+            "last_name": name.surname or ""
+        },
+        "date_of_birth": f"{dob.month or ''}/{dob.day or ''}/{dob.year or ''}",
+        "report_date": header.y2kReportedDate or header.reportDate or "",
+        "credit_score_info": score_info
+    }
+
+def stdio_request_meta():
+    """Return ``params._meta`` of the current FastMCP (stdio) request, if any."""
+    try:
+        return mcp.get_context().request_context.meta
+    except ValueError:
+        return None
+
+def stdio_trace_parent() -> tuple[str, str] | None:
+    """Return the remote trace parent from ``_meta.traceparent`` of the current FastMCP request, if any."""
+    return tracing.parse_traceparent(getattr(stdio_request_meta(), "traceparent", None))
+
+def stdio_progress():
+    """Send progress to the FastMCP (stdio) caller if it passed ``_meta.progressToken``.
+    Returns:
+        A context manager installing the reporter, or doing nothing if the
+        caller asked for no progress or a reporter is already installed.
+    """
+    progress_token = getattr(stdio_request_meta(), "progressToken", None)
+    if progress_token is None or progress.current() is not None:
+        return nullcontext()
+    context = mcp.get_context()
+
+    async def send(params: dict) -> None:
+        await context.session.send_notification(
+            types.ServerNotification(types.ProgressNotification(
+                params=types.ProgressNotificationParams(progressToken=progress_token, **params)
+            )),
+            related_request_id=context.request_id,
+        )
+
+    return progress.reporting(send)
+
+async def get_credit_profile(ssn: str, **applicant) -> CreditProfile | dict:
+    """Return the credit profile sections for an applicant, pulling them only on a cache miss.
+    Args:
+        ssn (str): Social Security Number of the applicant.
+        **applicant: Optional name, date of birth and address, see ``RequestTemplate.build``.
+    Returns:
+        CreditProfile: The ``REPORT_SECTIONS`` of ``creditProfile[0]``, or a dict
+        with an ``error`` key on failure. Cached profiles are shared by callers.
+    """
+    # Tools called over stdio are not inside a JSON-RPC request span; continue
+    # the caller's trace from the request's _meta instead
+    parent = stdio_trace_parent() if tracing.enabled() and not tracing.current_traceparent() else None
+    with tracing.span("credit_report.get", parent=parent):
+        try:
+            body = build_credit_report_request(ssn, **applicant)
+        except ValueError as e:
+            logging.error(f"Invalid credit report request: {e}")
+            return {
+                "error": str(e),
+                "ssn": ssn
+            }
 
-logging.info("Obtained Experian access token.")
+        cache_key = result_cache.key_for(
+            "profile",
+            request_template.fingerprint,
+            json.dumps(body["consumerPii"], sort_keys=True),
+        )
+        session = sessions.current()
+        if session is not None and (profile := session.get_profile(cache_key)) is not None:
+            logging.debug("Credit profile served from the session cache")
+            return profile
+        with tracing.span("cache.get") as span:
+            profile = await result_cache.get(cache_key)
+            span.set("cache.hit", profile is not None)
+        if profile is not None:
+            logging.debug(f"Credit profile cache hit ({result_cache.stats})")
+            if session is not None:
+                session.set_profile(cache_key, profile)
+            return profile
+
+        if deadlines.current() is not None:
+            profile = await inflight_pulls.do(cache_key, pull_and_cache_credit_profile, body, ssn, cache_key)
+            if session is not None and isinstance(profile, CreditProfile):
+                session.set_profile(cache_key, profile)
+            return profile
+        # The HTTP transport sets a deadline and progress reporter per JSON-RPC call; over stdio they start here
+        try:
+            with stdio_progress():
+                async with deadlines.scope(deadlines.timeout_from_meta(stdio_request_meta())):
+                    return await inflight_pulls.do(cache_key, pull_and_cache_credit_profile, body, ssn, cache_key)
+        except deadlines.DeadlineExceeded as e:
+            logging.warning(f"Credit report request abandoned: {e}")
+            return {
+                "error": str(e),
+                "ssn": ssn
+            }
 
 @mcp.tool()
-def credit_score(ssn: str) -> dict:
+async def credit_score(
+    ssn: str,
+    first_name: str | None = None,
+    middle_name: str | None = None,
+    last_name: str | None = None,
+    dob: str | None = None,
+    address_line1: str | None = None,
+    city: str | None = None,
+    state: str | None = None,
+    zip_code: str | None = None,
+) -> dict:
     """Fetch credit score for a given SSN from Experian API (mock implementation).
     Args:
         ssn (str): Social Security Number of the applicant.
+        first_name, middle_name, last_name (str, optional): Applicant name.
+        dob (str, optional): Applicant date of birth (MMDDYYYY or YYYY).
+        address_line1, city, state, zip_code (str, optional): Applicant current address.
     Returns:
         dict: A dictionary containing the credit score information.
     """
-    API_URL = (
-        "https://sandbox-us-api.experian.com/consumerservices/credit-profile/v2/credit-report"
+    profile = await get_credit_profile(
+        ssn,
+        first_name=first_name,
+        middle_name=middle_name,
+        last_name=last_name,
+        dob=dob,
+        address_line1=address_line1,
+        city=city,
+        state=state,
+        zip_code=zip_code,
+    )
+    if not isinstance(profile, CreditProfile):
+        return profile
+    with tracing.span("credit_score.extract"):
+        return extract_credit_score_info(profile, ssn)
+
+@mcp.tool()
+async def credit_report_sections(
+    ssn: str,
+    sections: list[str] | None = None,
+    fields: list[str] | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    first_name: str | None = None,
+    middle_name: str | None = None,
+    last_name: str | None = None,
+    dob: str | None = None,
+    address_line1: str | None = None,
+    city: str | None = None,
+    state: str | None = None,
+    zip_code: str | None = None,
+) -> dict:
+    """Fetch selected sections of a credit report, one page at a time.
+    Served from the same cached pull as credit_score for the same applicant.
+    Args:
+        ssn (str): Social Security Number of the applicant.
+        sections (list[str], optional): Sections to return, any of headerRecord,
+            consumerIdentity, riskModel, ssn, addressInformation, inquiry,
+            publicRecord, summaries, tradeline (default: all).
+        fields (list[str], optional): ``section.field`` selectors, e.g.
+            ``tradeline.balanceDate``; only those fields of the section's items are returned.
+        cursor (str, optional): ``next_cursor`` from the previous page.
+        limit (int): Maximum items per array section in one page (max 100).
+        first_name, middle_name, last_name, dob, address_line1, city, state, zip_code
+            (str, optional): Applicant details, as for credit_score.
+    Returns:
+        dict: ``sections``, ``totals`` (full length of each array section) and
+        ``next_cursor`` (None on the last page).
+    """
+    def first_page(name: str, value) -> dict | None:
+        # Progress notifications carry each selected section of the first page as soon as it is parsed
+        if cursor or (sections and name not in sections):
+            return None
+        section_fields = [selector for selector in fields or () if selector.partition(".")[0] == name]
+        try:
+            page = select_sections(CreditProfile(**{name: value}), REPORT_SECTIONS, [name], section_fields, None, limit)
+        except SelectionError:
+            return None
+        return {
+            "sections": page["sections"],
+            "totals": page["totals"]
+        }
+
+    with progress.partial_sections(first_page):
+        profile = await get_credit_profile(
+            ssn,
+            first_name=first_name,
+            middle_name=middle_name,
+            last_name=last_name,
+            dob=dob,
+            address_line1=address_line1,
+            city=city,
+            state=state,
+            zip_code=zip_code,
+        )
+    if not isinstance(profile, CreditProfile):
+        return profile
+    try:
+        with tracing.span("credit_report_sections.select"):
+            return select_sections(profile, REPORT_SECTIONS, sections, fields, cursor, limit)
+    except SelectionError as e:
+        return {
+            "error": str(e),
+            "ssn": ssn
+        }
+
+@mcp.tool()
+async def credit_features(
+    ssn: str,
+    first_name: str | None = None,
+    middle_name: str | None = None,
+    last_name: str | None = None,
+    dob: str | None = None,
+    address_line1: str | None = None,
+    city: str | None = None,
+    state: str | None = None,
+    zip_code: str | None = None,
+) -> dict:
+    """Compute underwriting features from the tradelines, inquiries and public records of a credit report.
+    Served from the same cached pull as credit_score for the same applicant.
+    Args:
+        ssn (str): Social Security Number of the applicant.
+        first_name, middle_name, last_name, dob, address_line1, city, state, zip_code
+            (str, optional): Applicant details, as for credit_score.
+    Returns:
+        dict: The SSN as reported (as in credit_score) and ``features``: tradeline
+        and open tradeline counts, open and revolving balances, revolving limit
+        and utilization (0-1), delinquency counts by bucket, account age stats
+        in months, inquiry counts over 6 and 12 months, and public record count
+        and amount. Undefined features are None.
+    """
+    profile = await get_credit_profile(
+        ssn,
+        first_name=first_name,
+        middle_name=middle_name,
+        last_name=last_name,
+        dob=dob,
+        address_line1=address_line1,
+        city=city,
+        state=state,
+        zip_code=zip_code,
     )
-    body = build_credit_report_request()
+    if not isinstance(profile, CreditProfile):
+        return profile
+    # numpy is only imported once features are first requested
+    from features import extract_features
+    with tracing.span("credit_features.compute"):
+        features = extract_features([profile])[0]
+    return {
+        "ssn": reported_ssn(profile, ssn),
+        "features": features
+    }
+
+async def pull_and_cache_credit_profile(body: dict, ssn: str, cache_key: str) -> CreditProfile | dict:
+    """Pull a credit profile from Experian and cache it if the pull succeeded.
+
+    Runs as the pull shared by concurrent calls for the applicant, so it has no
+    deadline of its own: each call stops waiting at its own deadline and
+    ``inflight_pulls`` abandons the pull once none is left waiting.
+    Raises:
+        OverloadedError: If the pull is not admitted because too many are running or queued.
+    """
+    with deadlines.cleared():
+        async with pull_admission.admit():
+            profile = await pull_credit_profile(body, ssn)
+    if isinstance(profile, CreditProfile):
+        await result_cache.set(cache_key, profile)
+    return profile
 
+async def pull_credit_profile(body: dict, ssn: str) -> CreditProfile | dict:
+    """Request a credit report from Experian and extract the sections served by the tools.
+    Args:
+        body (dict): Credit report request body.
+        ssn (str): SSN of the applicant, used in the result and error reports.
+    Returns:
+        CreditProfile: The ``REPORT_SECTIONS`` of ``creditProfile[0]``, or a dict
+        with an ``error`` key on failure.
+    """
     headers = {
             'Content-Type': 'application/json',
-            'Authorization': f'Bearer {access_token}',
             'accept': 'application/json',
             'clientReferenceId':'SBMYSQL'
     }
 
-    logging.debug(f"Request headers: {headers}")
-    logging.debug(f"Request body: {json.dumps(body, indent=2)}")
+    # Pretty-printing the request and the ~180 KB response is expensive, so only do it when debugging
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    if debug:
+        logging.debug(f"Request headers: {headers}")
+        logging.debug(f"Request body: {json.dumps(body, indent=2)}")
+
+    content = dumps(body)
+
+    async def fetch_credit_profile() -> CreditProfile:
+        """Make one attempt at pulling and parsing the report."""
+        if progress.enabled():
+            # Fetch the token up front so its arrival can be reported; stream() then reuses it
+            await tokens.get_token()
+            await progress.report("Access token acquired")
+        with tracing.span("experian.credit_report", kind="client") as span:
+            start = time.perf_counter()
+            await progress.report("Credit report requested from Experian")
+            async with tokens.stream(upstream.get_client(), "POST", CREDIT_REPORT_URL, content=content, headers=headers) as response:
+                span.set("http.status_code", response.status_code)
+                span.set("http.headers_ms", round((time.perf_counter() - start) * 1e3, 3))
+                if debug:
+                    logging.debug(f"Response status: {response.status_code}")
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+
+                # Decode only the sections the tools serve; stream them in when
+                # progress notifications can pass each one on as it arrives
+                with tracing.span("report.parse") as parse_span:
+                    parser = ProfileParser(REPORT_SECTIONS, stream=progress.enabled())
+                    chunks = response.aiter_bytes()
+                    received = 0
+                    reported = 0
+                    async for chunk in chunks:
+                        received += len(chunk)
+                        done = parser.feed(chunk)
+                        if len(parser.parsed) > reported and progress.enabled():
+                            # Pass on the sections completed by this chunk
+                            for name in list(parser.parsed)[reported:]:
+                                await progress.section(name, parser.parsed[name])
+                            reported = len(parser.parsed)
+                        if done:
+                            break
+                    profile = parser.close()
+                    for name in list(parser.parsed)[reported:]:
+                        await progress.section(name, parser.parsed[name])
+                    parse_span.set("report.parsed_bytes", received)
+                await progress.report("Credit report parsed")
+                # Drain the unparsed rest of the body so the connection can be reused
+                with tracing.span("report.drain"):
+                    async for _ in chunks:
+                        pass
+        return profile
 
     try:
-        response = requests.post(API_URL, json=body, headers=headers)
-        logging.debug(f"Response status: {response.status_code}")
-        logging.debug(f"Response body: {response.text}")
-        response.raise_for_status()
-        data = response.json()
-        
-        # Parse and return relevant credit score info from the data
-        credit_profile = data.get("creditProfile", [{}])[0]
-        
-        # Extract consumer identity
-        consumer_identity = credit_profile.get("consumerIdentity", {})
-        dob = consumer_identity.get("dob", {})
-        names = consumer_identity.get("name", [{}])
-        primary_name = names[0] if names else {}
-        
-        # Extract header record for report date
-        header = credit_profile.get("headerRecord", [{}])[0]
-        report_date = header.get("y2kReportedDate", header.get("reportDate", ""))
-        
-        # Extract risk model (credit score)
-        risk_models = credit_profile.get("riskModel", [])
-        score_info = {}
-        if risk_models:
-            risk_model = risk_models[0]
-            score_info = {
-                "score": int(risk_model.get("score", "0")),
-                "model_indicator": risk_model.get("modelIndicator", ""),
-                "evaluation": risk_model.get("evaluation", ""),
-                "score_factors": [
-                    {
-                        "code": factor.get("code", ""),
-                        "importance": factor.get("importance", "")
-                    }
-                    for factor in risk_model.get("scoreFactors", [])
-                ]
-            }
-        
-        # Extract SSN
-        ssn_records = credit_profile.get("ssn", [{}])
-        ssn_number = ssn_records[0].get("number", ssn) if ssn_records else ssn
-        
-        result = {
-            "ssn": ssn_number,
-            "consumer_name": {
-                "first_name": primary_name.get("firstName", ""),
-                "middle_name": primary_name.get("middleName", ""),
-                "last_name": primary_name.get("surname", "")
-            },
-            "date_of_birth": f"{dob.get('month', '')}/{dob.get('day', '')}/{dob.get('year', '')}",
-            "report_date": report_date,
-            "credit_score_info": score_info
-        }
+        # Retried with backoff, failed fast while Experian is down and hedged when slow
+        profile = await credit_report_calls.call(fetch_credit_profile)
+        if debug:
+            logging.debug(f"Parsed credit profile sections: {list(profile.sections())}")
+        return profile
 
-        logging.debug(json.dumps(result, indent=4))
-        return result
-        
-    except requests.exceptions.RequestException as e:
-        # Log as much context as possible for debugging
-        logging.error(f"response = {response}")
-        logging.error(f"Response body: {getattr(response, 'text', '')}")
+    except (TokenUnavailableError, ReportParseError, CircuitOpenError) as e:
         logging.error(f"Error making API request: {e}")
         return {
             "error": str(e),
             "ssn": ssn
         }
+    except httpx.HTTPError as e:
+        # Log as much context as possible for debugging
+        if isinstance(e, httpx.HTTPStatusError):
+            logging.error(f"response = {e.response}")
+            logging.error(f"Response body: {e.response.text}")
+        logging.error(f"Error making API request: {e!r}")
+        return {
+            "error": str(e) or type(e).__name__,
+            "ssn": ssn
+        }
+    except TimeoutError:
+        logging.error(f"Credit report request timed out after {credit_report_calls.attempt_timeout:.0f}s")
+        return {
+            "error": f"Experian API did not respond within {credit_report_calls.attempt_timeout:.0f}s",
+            "ssn": ssn
+        }
+
+@mcp.tool()
+async def credit_score_batch(ssns: list[str], concurrency: int | None = None) -> dict:
+    """Fetch credit scores for a list of SSNs from Experian API (mock implementation).
+    Args:
+        ssns (list[str]): Social Security Numbers of the applicants.
+        concurrency (int, optional): Maximum number of upstream pulls in flight.
+    Returns:
+        dict: Per-applicant results in input order, each with either a ``result``
+        or an ``error``, plus succeeded/failed counts. Applicants not scored
+        before the request's deadline are reported as errors.
+    """
+    if len(ssns) > BATCH_MAX_SIZE:
+        return {"error": f"Batch of {len(ssns)} SSNs exceeds the limit of {BATCH_MAX_SIZE}"}
+    limit = max(1, min(concurrency or BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    # Items stop a little before the request's deadline so the results scored
+    # so far are returned instead of the whole call failing with a timeout.
+    deadline = deadlines.current()
+    cutoff = None if deadline is None else deadline - BATCH_DEADLINE_RESERVE
+
+    items: list[dict | None] = [None] * len(ssns)
+    next_index = iter(range(len(ssns)))
+    completed = 0
+
+    async def score(ssn: str) -> dict:
+        if cutoff is None:
+            return await credit_score(ssn)
+        budget = cutoff - time.monotonic()
+        try:
+            if budget <= 0:
+                raise deadlines.DeadlineExceeded
+            async with deadlines.scope(budget):
+                return await credit_score(ssn)
+        except deadlines.DeadlineExceeded as e:
+            raise deadlines.DeadlineExceeded("Request deadline passed before the applicant was scored") from e
+
+    async def worker():
+        # Workers pull indices from a shared iterator, so at most ``limit``
+        # credit_score calls exist at once regardless of batch size.
+        nonlocal completed
+        for index in next_index:
+            ssn = ssns[index]
+            try:
+                # Progress is reported per item rather than per phase of each pull
+                with progress.muted():
+                    result = await score(ssn)
+            except Exception as e:
+                logging.error(f"Batch item {index} failed: {e}")
+                result = {"error": str(e) or type(e).__name__}
+            if "error" in result:
+                items[index] = {"ssn": ssn, "error": result["error"]}
+            else:
+                items[index] = {"ssn": ssn, "result": result}
+            completed += 1
+            await progress.report(f"Scored {completed} of {len(ssns)} applicants", total=len(ssns))
+
+    with stdio_progress():
+        async with anyio.create_task_group() as tg:
+            for _ in range(min(limit, len(ssns))):
+                tg.start_soon(worker)
+
+    failed = sum(1 for item in items if "error" in item)
+    return {
+        "results": items,
+        "succeeded": len(items) - failed,
+        "failed": failed
+    }
 
 @mcp.prompt()
 def build_credit_score_prompt(credit_report: str) -> str:
@@ -190,6 +723,454 @@ def build_credit_score_prompt(credit_report: str) -> str:
     # return f"You are a financial assistant. Generate a loan risk assessment for an applicant based on this credit report: {credit_report_data}."
     return f"You are a financial loan officer assistant. Generate an extensive loan risk assessment for this applicant given a SSN of 123-45-6789."
 
+def jsonrpc_result(request_id, result: bytes) -> bytes:
+    """Wrap a pre-serialized result in a JSON-RPC response envelope."""
+    return b'{"jsonrpc":"2.0","id":' + dumps(request_id) + b',"result":' + result + b'}'
+
+# JSON-RPC server error code for requests shed by admission control
+OVERLOADED_ERROR = -32000
+# Requests that ran past their deadline, as the MCP TypeScript SDK reports timeouts
+REQUEST_TIMEOUT_ERROR = -32001
+# Requests stopped by notifications/cancelled, as the MCP Python SDK answers them
+REQUEST_CANCELLED_ERROR = 0
+
+def jsonrpc_error(request_id, code: int, message: str, data: dict | None = None) -> bytes:
+    """Serialize a JSON-RPC error response."""
+    error = {
+        "code": code,
+        "message": message
+    }
+    if data is not None:
+        error["data"] = data
+    return dumps({
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": error
+    })
+
+class ClientDisconnected(Exception):
+    """Raised when an HTTP client disconnects before its response is ready."""
+
+def create_app():
+    """Create the Starlette app that serves MCP JSON-RPC over streamable HTTP."""
+    register_callback_metrics()
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+    from starlette.responses import Response, StreamingResponse
+    from starlette.requests import Request
+    from mcp.server.fastmcp.exceptions import ToolError
+
+    # Serialized results of the discovery methods, built once from the FastMCP
+    # tool and prompt registries; only the request id differs per response.
+    static_results: dict[str, bytes] = {}
+    # initialize results by negotiated protocol version
+    initialize_results: dict[str, bytes] = {}
+
+    async def load_static_results() -> None:
+        tools = await mcp.list_tools()
+        prompts = await mcp.list_prompts()
+        for version in sessions.SUPPORTED_PROTOCOL_VERSIONS:
+            initialize_results[version] = dumps({
+                "protocolVersion": version,
+                "capabilities": {
+                    "tools": {},
+                    "prompts": {}
+                },
+                "serverInfo": {
+                    "name": "Experian MCP Server",
+                    "version": "0.1"
+                }
+            })
+        static_results["initialize"] = initialize_results[sessions.SUPPORTED_PROTOCOL_VERSIONS[-1]]
+        static_results["tools/list"] = dumps({
+            "tools": [tool.model_dump(mode="json", by_alias=True, exclude_none=True) for tool in tools]
+        })
+        static_results["prompts/list"] = dumps({
+            "prompts": [prompt.model_dump(mode="json", by_alias=True, exclude_none=True) for prompt in prompts]
+        })
+        static_results["ping"] = b"{}"
+        logging.debug(f"Registered {len(tools)} tools and {len(prompts)} prompts for HTTP transport")
+
+    async def handle_tool_call(request_id, params: dict) -> bytes:
+        tool_name = params.get("name")
+        tool = mcp._tool_manager.get_tool(tool_name)
+        if tool is None:
+            return jsonrpc_error(request_id, -32601, f"Unknown tool: {tool_name}")
+        start = time.perf_counter()
+        outcome = "exception"
+        try:
+            with tracing.span(f"tool {tool_name}") as span:
+                result = await tool.run(params.get("arguments") or {})
+                outcome = "error" if isinstance(result, dict) and "error" in result else "ok"
+                span.set("tool.outcome", outcome)
+        except ToolError as e:
+            if isinstance(e.__cause__, OverloadedError):
+                # Shed load with a protocol error the caller can back off on
+                outcome = "overloaded"
+                logging.warning(f"{e.__cause__}")
+                return jsonrpc_error(
+                    request_id, OVERLOADED_ERROR, str(e.__cause__), {"retry_after": e.__cause__.retry_after}
+                )
+            # Tool failures are reported in the result so the caller (e.g. an LLM) can see them
+            logging.error(f"{e}")
+            return jsonrpc_result(request_id, dumps({
+                "content": [{"type": "text", "text": str(e)}],
+                "isError": True
+            }))
+        finally:
+            metrics.tool_calls.inc(tool_name, outcome)
+            metrics.tool_duration.observe(time.perf_counter() - start, tool_name)
+        with tracing.span("jsonrpc.serialize") as span:
+            response = jsonrpc_result(request_id, dumps(tool_result(result)))
+            span.set("response.bytes", len(response))
+        return response
+
+    async def handle_prompt_get(request_id, params: dict) -> bytes:
+        try:
+            result = await mcp.get_prompt(params.get("name"), params.get("arguments"))
+        except ValueError as e:
+            return jsonrpc_error(request_id, -32602, str(e))
+        return jsonrpc_result(request_id, result.model_dump_json(by_alias=True, exclude_none=True).encode())
+
+    # Methods whose result depends on the request parameters
+    method_handlers = {
+        "tools/call": handle_tool_call,
+        "prompts/get": handle_prompt_get,
+    }
+
+    # Tasks of the requests being handled, by session and JSON-RPC id, so
+    # notifications/cancelled can stop them; requests without a session share None
+    running_requests: dict[tuple[str | None, str | int], asyncio.Task] = {}
+
+    def session_id() -> str | None:
+        session = sessions.current()
+        return session.id if session is not None else None
+
+    async def run_request(request_id, handler: Awaitable[bytes], timeout: float | None) -> bytes:
+        """Run a request handler under its deadline, in a task the client can cancel by request id."""
+        async def run() -> bytes:
+            async with deadlines.scope(timeout):
+                return await handler
+
+        task = asyncio.ensure_future(run())
+        tracked = isinstance(request_id, (str, int)) and not isinstance(request_id, bool)
+        key = (session_id(), request_id)
+        if tracked:
+            running_requests[key] = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # The HTTP request itself is being cancelled, e.g. the client disconnected
+                raise
+            return jsonrpc_error(request_id, REQUEST_CANCELLED_ERROR, "Request cancelled")
+        finally:
+            if tracked and running_requests.get(key) is task:
+                del running_requests[key]
+
+    def cancel_request(request_id, reason) -> None:
+        task = running_requests.get((session_id(), request_id)) if isinstance(request_id, (str, int)) else None
+        if task is not None and not task.done():
+            logging.info(f"Cancelling request {request_id}: {reason or 'cancelled by the client'}")
+            task.cancel()
+
+    def progress_sender(notify: Callable[[bytes], None], progress_token) -> Callable[[dict], Awaitable[None]]:
+        """Return a progress reporter ``send`` passing ``notifications/progress`` messages to ``notify``."""
+        async def send(params: dict) -> None:
+            notify(dumps({
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": {"progressToken": progress_token, **params}
+            }))
+        return send
+
+    async def handle_message(
+        request_data, traceparent: str | None = None, notify: Callable[[bytes], None] | None = None
+    ) -> bytes | None:
+        """Handle one JSON-RPC message and return its serialized response, or None for notifications.
+
+        The request span continues the trace given in ``params._meta.traceparent``,
+        else the one in the HTTP ``traceparent`` header, else starts a new trace.
+        If ``notify`` is given and the request has a ``_meta.progressToken``, its
+        progress notifications are passed to ``notify`` while it runs.
+        """
+        if not isinstance(request_data, dict) or not isinstance(request_data.get("method"), str):
+            request_id = request_data.get("id") if isinstance(request_data, dict) else None
+            return jsonrpc_error(request_id, -32600, "Invalid Request")
+
+        method = request_data["method"]
+        request_id = request_data.get("id")
+        params = request_data.get("params")
+        if params is None:
+            params = {}
+        elif not isinstance(params, dict):
+            # MCP methods take their parameters by name; notifications get no error response
+            if "id" not in request_data:
+                return None
+            return jsonrpc_error(request_id, -32602, "Invalid params: params must be an object")
+
+        if "id" not in request_data:
+            # Notifications (e.g. notifications/initialized) get no response
+            logging.debug(f"Received notification: {method}")
+            if method == "notifications/cancelled":
+                cancel_request(params.get("requestId"), params.get("reason"))
+            elif method == "notifications/initialized" and sessions.current() is not None:
+                sessions.current().initialized = True
+            return None
+
+        if not static_results:
+            await load_static_results()
+
+        # Unknown methods share one label so clients cannot grow the metrics without bound
+        method_label = method if method in static_results or method in method_handlers else "other"
+        meta = params.get("_meta")
+        remote = tracing.parse_traceparent(meta.get("traceparent") if isinstance(meta, dict) else None)
+        start = time.perf_counter()
+        metrics.inflight_requests.inc()
+        with tracing.span(
+            f"jsonrpc {method_label}",
+            kind="server",
+            parent=remote or tracing.parse_traceparent(traceparent),
+            **{"rpc.method": method_label, "rpc.jsonrpc.request_id": str(request_id)}
+        ) as span:
+            try:
+                static_result = static_results.get(method)
+                session = sessions.current()
+                if method == "initialize":
+                    if session is not None:
+                        version = session.negotiate(params)
+                    else:
+                        version = sessions.negotiate_version(params.get("protocolVersion"))
+                    response = jsonrpc_result(request_id, initialize_results[version])
+                elif static_result is not None:
+                    response = jsonrpc_result(request_id, static_result)
+                elif method in method_handlers:
+                    progress_token = meta.get("progressToken") if isinstance(meta, dict) else None
+                    with (
+                        progress.reporting(progress_sender(notify, progress_token))
+                        if notify is not None and progress_token is not None else nullcontext()
+                    ):
+                        response = await run_request(
+                            request_id, method_handlers[method](request_id, params), deadlines.timeout_from_meta(meta or {})
+                        )
+                else:
+                    response = jsonrpc_error(request_id, -32601, f"Method not found: {method}")
+            except deadlines.DeadlineExceeded as e:
+                logging.warning(f"{method} request {request_id} abandoned: {e}")
+                response = jsonrpc_error(request_id, REQUEST_TIMEOUT_ERROR, str(e))
+            except Exception as e:
+                logging.error(f"Error processing {method} request: {e}", exc_info=True)
+                response = jsonrpc_error(request_id, -32603, str(e))
+            finally:
+                metrics.inflight_requests.dec()
+                metrics.requests_total.inc(method_label)
+                metrics.request_duration.observe(time.perf_counter() - start, method_label)
+
+            if response.startswith(b'{"jsonrpc":"2.0","id":' + dumps(request_id) + b',"error":'):
+                code = json.loads(response)["error"]["code"]
+                metrics.request_errors.inc(method_label, str(code))
+                span.set("rpc.jsonrpc.error_code", code)
+
+        logging.debug(f"Sending response: {response[:1000]}")
+        return response
+
+    async def handle_body(
+        request_data, traceparent: str | None, notify: Callable[[bytes], None] | None = None
+    ) -> bytes | None:
+        """Handle a single JSON-RPC message or a batch and return the serialized reply, if any."""
+        if isinstance(request_data, list):
+            responses = await asyncio.gather(*(handle_message(message, traceparent, notify) for message in request_data))
+            responses = [r for r in responses if r is not None]
+            return b"[" + b",".join(responses) + b"]" if responses else None
+        return await handle_message(request_data, traceparent, notify)
+
+    def wants_progress(request_data) -> bool:
+        """Whether any request in a message or batch carries a ``_meta.progressToken``."""
+        for message in request_data if isinstance(request_data, list) else [request_data]:
+            if isinstance(message, dict) and "id" in message and isinstance(message.get("params"), dict):
+                meta = message["params"].get("_meta")
+                if isinstance(meta, dict) and meta.get("progressToken") is not None:
+                    return True
+        return False
+
+    async def stream_events(
+        request_data, traceparent: str | None, session: sessions.Session | None
+    ) -> AsyncIterator[bytes]:
+        """Yield the progress notifications of a message or batch as SSE events, then its reply."""
+        events: asyncio.Queue[bytes | None] = asyncio.Queue()
+
+        async def work() -> None:
+            try:
+                with sessions.using(session):
+                    content = await handle_body(request_data, traceparent, events.put_nowait)
+                if content is not None:
+                    events.put_nowait(content)
+            finally:
+                events.put_nowait(None)
+
+        task = asyncio.ensure_future(work())
+        try:
+            while (event := await events.get()) is not None:
+                yield b"event: message\ndata: " + event + b"\n\n"
+            await task
+        finally:
+            if not task.done():
+                logging.info("Client disconnected from the event stream; cancelled its pending requests")
+                task.cancel()
+
+    async def until_disconnected(request: Request, work: Awaitable):
+        """Await ``work``, cancelling it if the client disconnects first.
+        Raises:
+            ClientDisconnected: If the client went away before ``work`` finished.
+        """
+        task = asyncio.ensure_future(work)
+
+        async def watch() -> None:
+            # After the body has been read, the next ASGI message is the disconnect
+            while (await request.receive())["type"] != "http.disconnect":
+                pass
+            task.cancel()
+
+        watcher = asyncio.ensure_future(watch())
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if watcher.done() and not asyncio.current_task().cancelling():
+                raise ClientDisconnected() from None
+            raise
+        finally:
+            watcher.cancel()
+
+    def is_initialize(request_data) -> bool:
+        """Whether a message or batch contains an ``initialize`` request."""
+        messages = request_data if isinstance(request_data, list) else [request_data]
+        return any(isinstance(message, dict) and message.get("method") == "initialize" for message in messages)
+
+    async def handle_mcp(request: Request):
+        """Handle MCP messages via streamable HTTP.
+
+        Accepts a single JSON-RPC message or a JSON-RPC 2.0 batch array; the
+        calls in a batch run concurrently and their responses are returned
+        together in one reply. If the client accepts ``text/event-stream`` and
+        a request carries ``_meta.progressToken``, the reply is an SSE stream of
+        the request's ``notifications/progress`` messages followed by the reply.
+
+        An ``initialize`` request without an ``Mcp-Session-Id`` header starts a
+        session whose id is returned in that header; requests naming an unknown
+        or expired session get a 404.
+        """
+        body = await request.body()
+        try:
+            request_data = json.loads(body)
+        except ValueError as e:
+            return Response(
+                content=jsonrpc_error(None, -32700, f"Parse error: {e}"),
+                media_type="application/json",
+                status_code=400
+            )
+
+        logging.debug(f"Received request: {request_data}")
+
+        if isinstance(request_data, list) and not request_data:
+            return Response(
+                content=jsonrpc_error(None, -32600, "Invalid Request: empty batch"),
+                media_type="application/json",
+                status_code=400
+            )
+
+        session_header = request.headers.get("mcp-session-id")
+        headers = {}
+        if not http_sessions.enabled:
+            session = None
+        elif session_header:
+            session = http_sessions.get(session_header)
+            if session is None:
+                return Response(
+                    content=jsonrpc_error(None, -32600, "Session not found or expired; send initialize to start a new one"),
+                    media_type="application/json",
+                    status_code=404
+                )
+        elif is_initialize(request_data):
+            session = http_sessions.create()
+            headers["mcp-session-id"] = session.id
+            logging.debug(f"Started session {session.id[:8]} ({len(http_sessions)} open)")
+        else:
+            # Clients that never initialize a session are served statelessly
+            session = None
+
+        if "text/event-stream" in request.headers.get("accept", "") and wants_progress(request_data):
+            # Stream progress notifications ahead of the response as server-sent events
+            return StreamingResponse(
+                stream_events(request_data, request.headers.get("traceparent"), session),
+                media_type="text/event-stream",
+                headers={**headers, "Cache-Control": "no-cache"}
+            )
+
+        try:
+            with sessions.using(session):
+                content = await until_disconnected(request, handle_body(request_data, request.headers.get("traceparent")))
+        except ClientDisconnected:
+            logging.info("Client disconnected; cancelled its pending requests")
+            return Response(status_code=499)
+
+        if content is None:
+            # Only notifications were received
+            return Response(status_code=202, headers=headers)
+
+        if compression.ENCODINGS:
+            headers["vary"] = "Accept-Encoding"
+        encoded, encoding = await compression.compress_async(content, request.headers.get("accept-encoding"))
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        metrics.response_bytes.inc(encoding or "identity", "uncompressed", amount=len(content))
+        metrics.response_bytes.inc(encoding or "identity", "sent", amount=len(encoded))
+
+        return Response(
+            content=encoded,
+            media_type="application/json",
+            headers=headers
+        )
+
+    async def handle_delete(request: Request):
+        """End the session named in the ``Mcp-Session-Id`` header and cancel its running requests."""
+        session_header = request.headers.get("mcp-session-id")
+        if not session_header:
+            return Response(
+                content=jsonrpc_error(None, -32600, "Missing Mcp-Session-Id header"),
+                media_type="application/json",
+                status_code=400
+            )
+        if not http_sessions.delete(session_header):
+            return Response(status_code=404)
+        for (owner, _), task in list(running_requests.items()):
+            if owner == session_header:
+                task.cancel()
+        logging.debug(f"Ended session {session_header[:8]} ({len(http_sessions)} open)")
+        return Response(status_code=204)
+
+    async def handle_metrics(request: Request):
+        """Serve metrics in the Prometheus text exposition format."""
+        return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        """Build the discovery responses and warm up at startup; close pooled upstream connections on shutdown."""
+        await load_static_results()
+        await warm_up()
+        log_startup_time()
+        yield
+        await upstream.aclose()
+
+    return Starlette(
+        debug=True,
+        lifespan=lifespan,
+        routes=[
+            Route("/mcp", endpoint=handle_mcp, methods=["POST"]),
+            Route("/mcp", endpoint=handle_delete, methods=["DELETE"]),
+            Route("/metrics", endpoint=handle_metrics, methods=["GET"]),
+        ]
+    )
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Experian MCP Server')
@@ -212,173 +1193,79 @@ def parse_args():
         default=8000,
         help='Port to bind to for HTTP transport (default: 8000)'
     )
-    return parser.parse_args()
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes for HTTP transport (default: 1)'
+    )
+    parser.add_argument(
+        '--warm-up',
+        action='store_true',
+        help='Fetch the Experian access token before serving (default: on first request)'
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.workers > 1 and args.transport != 'streamable-http':
+        parser.error('--workers requires --transport streamable-http')
+    return args
+
+def share_state_between_workers(state_dir: str) -> None:
+    """Point the token and result caches of worker processes at files they share.
+
+    Workers inherit the environment, so each reads the same token cache and
+    SQLite result cache at import. Paths set explicitly in the environment
+    are kept.
+    """
+    os.environ.setdefault("EXPERIAN_TOKEN_CACHE", os.path.join(state_dir, "token.json"))
+    os.environ.setdefault("EXPERIAN_CACHE_DB", os.path.join(state_dir, "cache.db"))
+
+IMPORT_SECONDS = time.perf_counter() - STARTED_AT
 
 if __name__ == "__main__":
     args = parse_args()
+    if args.warm_up:
+        # Also seen by HTTP worker processes, which read it at import
+        os.environ["EXPERIAN_WARM_UP"] = "1"
+        WARM_UP = True
     
     if args.transport == 'streamable-http':
         # Use streamable-http transport with Starlette/uvicorn
         import uvicorn
-        from starlette.applications import Starlette
-        from starlette.routing import Route
-        from starlette.responses import Response
-        from starlette.requests import Request
-        import json
-        
-        logging.info(f"Starting Experian MCP Server with streamable-http transport on {args.host}:{args.port}")
-        
-        # Get the underlying MCP server from FastMCP
-        mcp_server = mcp._mcp_server
-        
-        async def handle_mcp(request: Request):
-            """Handle MCP messages via streamable HTTP"""
+
+        logging.info(
+            f"Starting Experian MCP Server with streamable-http transport on {args.host}:{args.port}"
+            f" ({args.workers} worker{'s' if args.workers > 1 else ''})"
+        )
+
+        if args.workers == 1:
+            uvicorn.run(create_app(), host=args.host, port=args.port, log_level="info")
+        else:
+            # Workers import this module by name, so they share state only through files
+            import shutil
+            import tempfile
+
+            state_dir = tempfile.mkdtemp(prefix="experian-mcp-")
             try:
-                # Read and parse the request body
-                body = await request.body()
-                request_data = json.loads(body)
-                
-                logging.debug(f"Received request: {request_data}")
-                
-                # Handle different MCP methods
-                method = request_data.get("method")
-                request_id = request_data.get("id")
-                
-                if method == "initialize":
-                    # Return initialization response
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {
-                            "protocolVersion": "2024-11-05",
-                            "capabilities": {
-                                "tools": {},
-                                "prompts": {}
-                            },
-                            "serverInfo": {
-                                "name": "Experian MCP Server",
-                                "version": "0.1"
-                            }
-                        }
-                    }
-                elif method == "tools/list":
-                    # Return list of tools
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {
-                            "tools": [
-                                {
-                                    "name": "credit_score",
-                                    "description": "Fetch credit score for a given SSN from Experian API (mock implementation).\nArgs:\n    ssn (str): Social Security Number of the applicant.\nReturns:\n    dict: A dictionary containing the credit score information.",
-                                    "inputSchema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "ssn": {
-                                                "title": "Ssn",
-                                                "type": "string"
-                                            }
-                                        },
-                                        "required": ["ssn"]
-                                    }
-                                }
-                            ]
-                        }
-                    }
-                elif method == "tools/call":
-                    # Handle tool execution
-                    tool_name = request_data.get("params", {}).get("name")
-                    tool_args = request_data.get("params", {}).get("arguments", {})
-                    
-                    if tool_name == "credit_score":
-                        ssn = tool_args.get("ssn")
-                        result = credit_score(ssn)
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request_id,
-                            "result": {
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "text": json.dumps(result, indent=2)
-                                    }
-                                ]
-                            }
-                        }
-                    else:
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request_id,
-                            "error": {
-                                "code": -32601,
-                                "message": f"Unknown tool: {tool_name}"
-                            }
-                        }
-                elif method == "prompts/list":
-                    # Return list of prompts
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {
-                            "prompts": [
-                                {
-                                    "name": "build_credit_score_prompt",
-                                    "description": "Build a prompt for generating a loan risk assessment based on the credit score.",
-                                    "arguments": [
-                                        {
-                                            "name": "credit_report",
-                                            "description": "JSON string or dict containing the credit report data",
-                                            "required": True
-                                        }
-                                    ]
-                                }
-                            ]
-                        }
-                    }
-                else:
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {
-                            "code": -32601,
-                            "message": f"Method not found: {method}"
-                        }
-                    }
-                
-                logging.debug(f"Sending response: {response}")
-                
-                return Response(
-                    content=json.dumps(response),
-                    media_type="application/json",
-                    headers={
-                        "Content-Type": "application/json",
-                    }
+                share_state_between_workers(state_dir)
+                # A session lives in the worker that started it, which later requests may not reach
+                os.environ["EXPERIAN_SESSIONS"] = "0"
+                logging.info("MCP sessions are disabled with more than one worker; requests are served statelessly")
+                if credit_report_rate_limit.rate > 0:
+                    # Each worker paces its own requests, so split the quota between them
+                    os.environ["EXPERIAN_RATE_LIMIT"] = str(credit_report_rate_limit.rate / args.workers)
+                    os.environ["EXPERIAN_RATE_BURST"] = str(max(1.0, credit_report_rate_limit.burst / args.workers))
+                uvicorn.run(
+                    "server:create_app",
+                    factory=True,
+                    host=args.host,
+                    port=args.port,
+                    workers=args.workers,
+                    log_level="info"
                 )
-                
-            except Exception as e:
-                logging.error(f"Error processing request: {e}", exc_info=True)
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": request_data.get("id") if 'request_data' in locals() else None,
-                    "error": {
-                        "code": -32603,
-                        "message": str(e)
-                    }
-                }
-                return Response(
-                    content=json.dumps(error_response),
-                    media_type="application/json",
-                    status_code=500
-                )
-        
-        app = Starlette(
-            debug=True,
-            routes=[
-                Route("/mcp", endpoint=handle_mcp, methods=["POST"]),
-            ]
-        )
-        
-        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+            finally:
+                shutil.rmtree(state_dir, ignore_errors=True)
     else:
         # Use stdio transport (default)
         logging.info("Starting Experian MCP Server with stdio transport")
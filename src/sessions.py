@@ -0,0 +1,183 @@
+"""MCP sessions on the streamable HTTP transport.
+
+An ``initialize`` request without an ``Mcp-Session-Id`` header starts a
+session; its id is returned in that header and the client sends it with every
+later request. A session keeps the protocol version and client capabilities
+negotiated at initialization and a small cache of the credit profiles pulled
+in it, so the calls of one conversation (``credit_score``, then
+``credit_report_sections``, then ``credit_features`` for the same applicant)
+reuse one pull even after busier sessions have pushed it out of the shared
+result cache. Cached profiles expire after ``EXPERIAN_CACHE_TTL`` like the
+shared cache's entries, and with ``EXPERIAN_CACHE_TTL=0`` nothing is cached.
+
+Sessions idle for longer than ``EXPERIAN_SESSION_TTL`` are dropped, as are the
+least recently used ones beyond ``EXPERIAN_MAX_SESSIONS``, so the memory held
+for sessions stays bounded. A request naming an unknown or expired session is
+answered with HTTP 404, upon which the client starts a new one. Requests
+without a session id are still served statelessly.
+
+Sessions live in the memory of one process. With ``EXPERIAN_SESSIONS=0``, as
+``--workers N`` sets for its worker processes, none are started and every
+request is served statelessly, since another worker could not find them.
+
+Settings are read from the environment:
+
+    EXPERIAN_SESSIONS                 0 to serve every request statelessly (default 1)
+    EXPERIAN_SESSION_TTL              seconds an idle session is kept (default 1800)
+    EXPERIAN_MAX_SESSIONS             sessions kept at once (default 1000)
+    EXPERIAN_SESSION_CACHE_ENTRIES    credit profiles cached per session; 0 disables (default 8)
+    EXPERIAN_SESSION_CACHE_MAX_BYTES  size limit of each session's cache in bytes (default 1 MiB)
+"""
+
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+import credit_profile
+from cache import CACHE_TTL, MemoryCache
+from credit_profile import CreditProfile
+
+SESSIONS_ENABLED = os.getenv("EXPERIAN_SESSIONS", "1").lower() in ("1", "true", "yes")
+SESSION_TTL = float(os.getenv("EXPERIAN_SESSION_TTL", "1800"))
+MAX_SESSIONS = max(1, int(os.getenv("EXPERIAN_MAX_SESSIONS", "1000")))
+SESSION_CACHE_ENTRIES = max(0, int(os.getenv("EXPERIAN_SESSION_CACHE_ENTRIES", "8")))
+SESSION_CACHE_MAX_BYTES = int(os.getenv("EXPERIAN_SESSION_CACHE_MAX_BYTES", str(1024 * 1024)))
+
+# Protocol versions the HTTP transport implements, oldest first
+SUPPORTED_PROTOCOL_VERSIONS = ("2024-11-05", "2025-03-26")
+
+
+def negotiate_version(requested) -> str:
+    """Return the client's requested protocol version if supported, else the latest supported one."""
+    return requested if requested in SUPPORTED_PROTOCOL_VERSIONS else SUPPORTED_PROTOCOL_VERSIONS[-1]
+
+
+class Session:
+    """State of one client session.
+
+    Args:
+        session_id (str): Value of the ``Mcp-Session-Id`` header.
+        cache_entries (int): Credit profiles kept in the session's cache.
+        cache_ttl (float): Seconds a cached profile stays valid; 0 disables the cache.
+        cache_max_bytes (int): Size limit of the session's cache, as encoded profiles.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        cache_entries: int = SESSION_CACHE_ENTRIES,
+        cache_ttl: float = CACHE_TTL,
+        cache_max_bytes: int = SESSION_CACHE_MAX_BYTES,
+    ):
+        self.id = session_id
+        self.created_at = time.monotonic()
+        self.last_seen = self.created_at
+        self.protocol_version = SUPPORTED_PROTOCOL_VERSIONS[-1]
+        self.client_info: dict = {}
+        self.client_capabilities: dict = {}
+        self.initialized = False
+        self.cache_ttl = cache_ttl
+        self.profiles = MemoryCache(
+            max_entries=cache_entries if cache_ttl > 0 else 0,
+            max_bytes=cache_max_bytes,
+        )
+
+    def negotiate(self, params: dict) -> str:
+        """Record the client's ``initialize`` params and return the protocol version to use."""
+        self.protocol_version = negotiate_version(params.get("protocolVersion"))
+        self.client_info = params.get("clientInfo") or {}
+        self.client_capabilities = params.get("capabilities") or {}
+        return self.protocol_version
+
+    def get_profile(self, key: str) -> CreditProfile | None:
+        """Return a credit profile pulled in this session, if still cached."""
+        if not self.profiles.max_entries:
+            return None
+        return self.profiles.get(key)
+
+    def set_profile(self, key: str, profile: CreditProfile) -> None:
+        """Cache a credit profile for this session's later calls, unless already cached."""
+        if not self.profiles.max_entries or self.profiles.get(key) is not None:
+            return
+        size = len(credit_profile.encode(profile))
+        self.profiles.set(key, profile, size, time.time() + self.cache_ttl)
+
+
+class SessionStore:
+    """Sessions by id, expired after ``ttl`` idle seconds and limited to ``max_sessions``.
+
+    Args:
+        ttl (float): Seconds a session may go unused.
+        max_sessions (int): Sessions kept at once; the least recently used are dropped beyond it.
+        enabled (bool): Whether sessions are started at all.
+    """
+
+    def __init__(self, ttl: float = SESSION_TTL, max_sessions: int = MAX_SESSIONS, enabled: bool = SESSIONS_ENABLED):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.created = 0
+        self.expired = 0
+        # Least recently used first
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self) -> Session:
+        """Start a new session."""
+        self._expire()
+        while len(self._sessions) >= self.max_sessions:
+            _, oldest = self._sessions.popitem(last=False)
+            self.expired += 1
+            logging.info(f"Dropped least recently used session {oldest.id[:8]}; {self.max_sessions} sessions open")
+        session = Session(secrets.token_urlsafe(24))
+        self._sessions[session.id] = session
+        self.created += 1
+        return session
+
+    def get(self, session_id: str) -> Session | None:
+        """Return the session with ``session_id`` and mark it used, or None if unknown or expired."""
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_seen = time.monotonic()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        """End a session; returns whether it existed."""
+        return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_seen > cutoff:
+                break
+            del self._sessions[session.id]
+            self.expired += 1
+            logging.debug(f"Session {session.id[:8]} expired")
+
+
+_session: ContextVar[Session | None] = ContextVar("session", default=None)
+
+
+def current() -> Session | None:
+    """Return the session of the request being handled, if it has one."""
+    return _session.get()
+
+
+@contextmanager
+def using(session: Session | None) -> Iterator[None]:
+    """Handle the enclosed block as part of ``session``."""
+    token = _session.set(session)
+    try:
+        yield
+    finally:
+        _session.reset(token)
@@ -0,0 +1,63 @@
+"""Coalescing of concurrent calls that share a key.
+
+While a call for a key is in flight, later callers with the same key wait for
+that call instead of starting their own, and all of them receive its result or
+its exception. Used so that bursts of ``credit_score`` calls for one applicant
+make a single upstream request. Once every caller waiting for a call has been
+cancelled, the call is cancelled too, so abandoned work stops.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its outcome."""
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self.calls = 0
+        self.shared = 0
+        self.abandoned = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+        """Run ``fn(*args)`` unless a call for ``key`` is already in flight, then await it.
+
+        The shared call runs in its own task, so a caller that is cancelled
+        does not cancel the call for the other waiters; the last waiter to be
+        cancelled cancels the call. The call runs in a copy of the context of
+        the caller that started it; a call shared by requests with different
+        deadlines should clear that caller's (``deadlines.cleared()``).
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fn(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.calls += 1
+        else:
+            self.shared += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Every caller has gone; later callers start a fresh call
+                    if self._calls.get(key) is task:
+                        del self._calls[key]
+                    task.cancel()
+                    self.abandoned += 1
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter went away.
+            task.exception()
@@ -0,0 +1,257 @@
+"""OAuth access token lifecycle for the Experian API.
+
+``TokenManager`` keeps the current bearer token together with its expiry,
+refreshes it in the background shortly before it expires (backing off after
+failures and giving up after a few until the token is next needed), and collapses
+concurrent refreshes (for example many requests seeing a 401 at once) into a
+single token request. ``request()`` and ``stream()`` attach the token to an
+upstream call and transparently retry once with a fresh token when the call
+is rejected.
+
+With a cache file, the token is shared between processes (for example the
+workers of a multi-worker HTTP server): refreshes are serialized with an
+exclusive lock on ``<cache file>.lock`` and a process that finds a token
+another process has just fetched adopts it instead of logging in again.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+
+# Experian sandbox tokens are valid for 30 minutes; used when expires_in is absent.
+DEFAULT_TOKEN_TTL = 1800.0
+REFRESH_MARGIN = float(os.getenv("EXPERIAN_TOKEN_REFRESH_MARGIN", "60"))
+# Background refresh retries back off exponentially with jitter from RETRY_BACKOFF
+# up to RETRY_MAX_BACKOFF seconds, and stop after MAX_REFRESH_FAILURES failures in a row
+RETRY_BACKOFF = 5.0
+RETRY_MAX_BACKOFF = 300.0
+MAX_REFRESH_FAILURES = 5
+# Shortest pause between background refreshes, however short-lived the tokens
+MIN_REFRESH_INTERVAL = 1.0
+
+
+class TokenUnavailableError(Exception):
+    """Raised when no valid access token can be obtained."""
+
+
+class TokenManager:
+    """Caches an OAuth token and refreshes it before it expires.
+
+    Args:
+        fetch: Coroutine function returning the token endpoint JSON response
+            (``access_token`` and ``expires_in``), or None on failure.
+        refresh_margin (float): Seconds before expiry to refresh proactively;
+            at most half the token's lifetime, so short-lived tokens are still
+            used for a while before being replaced.
+        cache_path (str | None): Optional file used to persist the token so it
+            survives restarts and can be reused by other local processes.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[dict | None]],
+        refresh_margin: float = REFRESH_MARGIN,
+        cache_path: str | None = None,
+    ):
+        self._fetch = fetch
+        self.refresh_margin = refresh_margin
+        self.cache_path = cache_path
+        self.access_token: str | None = None
+        self.expires_at = 0.0
+        # Lifetime of the current token, which caps the refresh margin
+        self.ttl = DEFAULT_TOKEN_TTL
+        self.refresh_count = 0
+        self._inflight: asyncio.Future | None = None
+        self._refresher: asyncio.Task | None = None
+        # Set when the background loop gave up; cleared by the next successful refresh
+        self._refresher_stopped = False
+        if cache_path:
+            self._load_cache()
+
+    @property
+    def margin(self) -> float:
+        """Seconds before expiry at which the current token is refreshed."""
+        return min(self.refresh_margin, self.ttl / 2)
+
+    def is_valid(self, margin: float = 0.0) -> bool:
+        """Return True if the current token is usable for at least ``margin`` seconds."""
+        return self.access_token is not None and time.time() < self.expires_at - margin
+
+    async def get_token(self) -> str:
+        """Return a valid token, fetching one only if none is usable.
+
+        Raises:
+            TokenUnavailableError: If a new token is needed and cannot be fetched.
+        """
+        self._ensure_refresher()
+        if self.is_valid():
+            return self.access_token
+        return await self.refresh()
+
+    async def refresh(self, stale_token: str | None = None) -> str:
+        """Fetch a new token, sharing one in-flight fetch between all callers.
+
+        Args:
+            stale_token (str | None): Token the caller saw rejected. If the
+                current token already differs, it was refreshed meanwhile and
+                is returned without another fetch.
+        """
+        if stale_token is not None and self.access_token != stale_token and self.is_valid():
+            return self.access_token
+        loop = asyncio.get_running_loop()
+        if self._inflight is None or self._inflight.done() or self._inflight.get_loop() is not loop:
+            self._inflight = loop.create_task(self._do_refresh(stale_token))
+        token = await asyncio.shield(self._inflight)
+        self._refresher_stopped = False
+        return token
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send an authorized request, retrying once with a fresh token on 401."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        token = await self.get_token()
+        headers["Authorization"] = f"Bearer {token}"
+        response = await client.request(method, url, headers=headers, **kwargs)
+        if response.status_code != 401:
+            return response
+
+        logging.info("Access token rejected by Experian; refreshing and retrying.")
+        await response.aclose()
+        token = await self.refresh(stale_token=token)
+        headers["Authorization"] = f"Bearer {token}"
+        return await client.request(method, url, headers=headers, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Like ``request()``, but yields a response whose body has not been read yet."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        token = await self.get_token()
+        headers["Authorization"] = f"Bearer {token}"
+        async with client.stream(method, url, headers=headers, **kwargs) as response:
+            if response.status_code != 401:
+                yield response
+                return
+            # Read the short error body so the connection goes back to the pool
+            await response.aread()
+
+        logging.info("Access token rejected by Experian; refreshing and retrying.")
+        token = await self.refresh(stale_token=token)
+        headers["Authorization"] = f"Bearer {token}"
+        async with client.stream(method, url, headers=headers, **kwargs) as response:
+            yield response
+
+    async def _do_refresh(self, stale_token: str | None = None) -> str:
+        if not self.cache_path:
+            return await self._fetch_token()
+
+        lock_fd = await asyncio.to_thread(self._lock_cache)
+        try:
+            # Another process may have refreshed while this one waited for the lock
+            cached = self._read_cache()
+            if cached is not None:
+                token, expires_at, ttl = cached
+                if token != stale_token and time.time() < expires_at - min(self.refresh_margin, ttl / 2):
+                    self.access_token, self.expires_at, self.ttl = token, expires_at, ttl
+                    logging.info("Reusing Experian access token refreshed by another process.")
+                    return self.access_token
+            return await self._fetch_token()
+        finally:
+            os.close(lock_fd)
+
+    async def _fetch_token(self) -> str:
+        token_data = await self._fetch()
+        if not token_data or not token_data.get("access_token"):
+            raise TokenUnavailableError("Could not obtain an Experian access token.")
+
+        try:
+            ttl = float(token_data.get("expires_in", DEFAULT_TOKEN_TTL))
+        except (TypeError, ValueError):
+            ttl = DEFAULT_TOKEN_TTL
+        self.access_token = token_data["access_token"]
+        self.expires_at = time.time() + ttl
+        self.ttl = ttl
+        self.refresh_count += 1
+        logging.info(f"Obtained Experian access token (expires in {ttl:.0f}s).")
+        if self.cache_path:
+            self._save_cache()
+        return self.access_token
+
+    def _ensure_refresher(self) -> None:
+        """Start the background refresh loop on the running event loop, unless it gave up."""
+        if self._refresher_stopped:
+            return
+        loop = asyncio.get_running_loop()
+        if self._refresher is None or self._refresher.done() or self._refresher.get_loop() is not loop:
+            self._refresher = loop.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        failures = 0
+        while True:
+            delay = self.expires_at - self.margin - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                # Check again: a rejected token may have been replaced meanwhile
+                continue
+            try:
+                await self.refresh(stale_token=self.access_token)
+            except Exception as e:
+                failures += 1
+                if failures >= MAX_REFRESH_FAILURES:
+                    # Stop polling the token endpoint, e.g. with bad credentials, until a
+                    # request needs a token again
+                    logging.error(
+                        f"Background token refresh failed {failures} times in a row ({e}); "
+                        "stopping until the next successful refresh"
+                    )
+                    self._refresher_stopped = True
+                    return
+                backoff = random.uniform(0, min(RETRY_MAX_BACKOFF, RETRY_BACKOFF * 2 ** (failures - 1)))
+                logging.error(f"Background token refresh failed: {e}; retrying in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                continue
+            failures = 0
+            await asyncio.sleep(MIN_REFRESH_INTERVAL)
+
+    def _lock_cache(self) -> int:
+        """Block until this process holds the exclusive token refresh lock; return its fd."""
+        fd = os.open(f"{self.cache_path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except OSError:
+            os.close(fd)
+            raise
+        return fd
+
+    def _read_cache(self) -> tuple[str, float, float] | None:
+        """Return the cached ``(access_token, expires_at, ttl)`` if it has not expired."""
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not cached.get("access_token") or cached.get("expires_at", 0) <= time.time():
+            return None
+        return cached["access_token"], cached["expires_at"], cached.get("ttl", DEFAULT_TOKEN_TTL)
+
+    def _load_cache(self) -> None:
+        cached = self._read_cache()
+        if cached is not None:
+            self.access_token, self.expires_at, self.ttl = cached
+            logging.info(f"Reusing cached Experian access token from {self.cache_path}.")
+
+    def _save_cache(self) -> None:
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"access_token": self.access_token, "expires_at": self.expires_at, "ttl": self.ttl}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logging.warning(f"Could not write token cache {self.cache_path}: {e}")
@@ -0,0 +1,309 @@
+"""Lightweight tracing spans for the MCP server and client.
+
+``span()`` times a block of code and records it with a trace id, its own span
+id and the id of the enclosing span, which is tracked in a context variable so
+it follows asyncio tasks. A trace started by the client is continued by the
+server through a W3C ``traceparent`` value, sent in the JSON-RPC request's
+``params._meta`` and as an HTTP header.
+
+Finished spans are exported according to ``EXPERIAN_TRACE_EXPORT``:
+
+    unset or empty               tracing disabled; ``span()`` is a no-op
+    a file path                  one JSON object per span appended to the file
+    an http(s):// URL            OTLP/HTTP JSON, e.g. http://localhost:4318/v1/traces
+
+Either way spans are serialized and written in batches from a background
+thread, so a slow disk or collector does not hold up request handling.
+"""
+
+import atexit
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Iterator
+
+TRACE_EXPORT = os.getenv("EXPERIAN_TRACE_EXPORT", "")
+# Spans are exported from a background thread in batches of up to EXPORT_BATCH_SIZE,
+# at least every OTLP_FLUSH_INTERVAL (FILE_FLUSH_INTERVAL for files) seconds
+EXPORT_BATCH_SIZE = 512
+OTLP_FLUSH_INTERVAL = 5.0
+FILE_FLUSH_INTERVAL = 1.0
+# Seconds the exporter thread is given at exit to send the spans still buffered
+CLOSE_TIMEOUT = 5.0
+
+# OTLP span kinds
+KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: str | None, attributes: dict):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.error: str | None = None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    def set(self, key: str, value) -> None:
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value identifying this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded by ``span()`` while tracing is disabled."""
+
+    trace_id = None
+    traceparent = None
+
+    def set(self, key: str, value) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class BatchExporter:
+    """Exports finished spans in batches from a background thread.
+
+    Spans are buffered in memory and handed to ``_send`` from a daemon thread
+    every ``flush_interval`` seconds or once ``EXPORT_BATCH_SIZE`` spans are
+    waiting, so exporting never blocks the event loop. Closing sends the
+    spans still buffered.
+    """
+
+    flush_interval = OTLP_FLUSH_INTERVAL
+
+    def __init__(self, service_name: str):
+        self.service_name = service_name
+        self._buffer: list[Span] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._buffer.append(span)
+            full = len(self._buffer) >= EXPORT_BATCH_SIZE
+        if full:
+            self._wake.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=CLOSE_TIMEOUT)
+
+    def _run(self) -> None:
+        with self._open():
+            while True:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                with self._lock:
+                    batch, self._buffer = self._buffer, []
+                if batch:
+                    self._send(batch)
+                if self._closed:
+                    return
+
+    def _open(self):
+        """Return a context manager holding what ``_send`` writes to while the thread runs."""
+        return nullcontext()
+
+    def _send(self, batch: list[Span]) -> None:
+        raise NotImplementedError
+
+
+class FileExporter(BatchExporter):
+    """Appends finished spans to a JSON Lines file."""
+
+    flush_interval = FILE_FLUSH_INTERVAL
+
+    def __init__(self, path: str, service_name: str):
+        self._file = open(path, "a")
+        super().__init__(service_name)
+
+    def _open(self):
+        return self._file
+
+    def _send(self, batch: list[Span]) -> None:
+        lines = []
+        for span in batch:
+            record = span.to_dict()
+            record["service"] = self.service_name
+            lines.append(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        try:
+            self._file.writelines(lines)
+            self._file.flush()
+        except OSError as e:
+            logging.warning(f"Could not export {len(batch)} spans to {self._file.name}: {e}")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpExporter(BatchExporter):
+    """Posts finished spans to an OTLP/HTTP JSON collector in batches.
+
+    Export failures are logged and the batch is dropped.
+    """
+
+    def __init__(self, endpoint: str, service_name: str):
+        self.endpoint = endpoint
+        super().__init__(service_name)
+
+    def _open(self):
+        import httpx
+
+        self._client = httpx.Client(timeout=self.flush_interval)
+        return self._client
+
+    def _send(self, batch: list[Span]) -> None:
+        import httpx
+
+        try:
+            self._client.post(self.endpoint, json=self._payload(batch)).raise_for_status()
+        except httpx.HTTPError as e:
+            logging.warning(f"Could not export {len(batch)} spans to {self.endpoint}: {e}")
+
+    def _payload(self, batch: list[Span]) -> dict:
+        spans = []
+        for span in batch:
+            record = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": KINDS.get(span.kind, 1),
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+            }
+            if span.parent_id:
+                record["parentSpanId"] = span.parent_id
+            if span.error:
+                record["status"] = {"code": 2, "message": span.error}
+            spans.append(record)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "experian-mcp"}, "spans": spans}],
+            }]
+        }
+
+
+_exporter: BatchExporter | None = None
+
+
+def configure(service_name: str, export: str = TRACE_EXPORT) -> None:
+    """Set up span export for this process; a no-op when ``export`` is empty."""
+    global _exporter
+    if _exporter is not None or not export:
+        return
+    if export.startswith(("http://", "https://")):
+        _exporter = OtlpExporter(export, service_name)
+    else:
+        _exporter = FileExporter(export, service_name)
+    atexit.register(_exporter.close)
+    logging.info(f"Exporting trace spans to {export}")
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def parse_traceparent(value) -> tuple[str, str] | None:
+    """Return ``(trace_id, parent_span_id)`` from a W3C traceparent value, or None if invalid."""
+    if not isinstance(value, str):
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32:
+        return None
+    return parts[1].lower(), parts[2].lower()
+
+
+def current_traceparent() -> str | None:
+    """Return the traceparent of the current span, for propagating it to a callee."""
+    current = _current.get()
+    return current.traceparent if current is not None else None
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", parent: tuple[str, str] | None = None, **attributes) -> Iterator[Span]:
+    """Record the enclosed block as a span.
+
+    Args:
+        name (str): Span name, e.g. ``jsonrpc tools/call``.
+        kind (str): ``internal``, ``server`` or ``client``.
+        parent (tuple[str, str], optional): ``(trace_id, span_id)`` of a remote
+            parent, from ``parse_traceparent``. Defaults to the current span,
+            or a new trace if there is none.
+        **attributes: Initial span attributes.
+    """
+    if _exporter is None:
+        yield _NOOP
+        return
+
+    if parent is not None:
+        trace_id, parent_id = parent
+    else:
+        current = _current.get()
+        if current is not None:
+            trace_id, parent_id = current.trace_id, current.span_id
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+
+    record = Span(name, kind, trace_id, parent_id, attributes)
+    token = _current.set(record)
+    try:
+        yield record
+    except BaseException as e:
+        record.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record.end_ns = time.time_ns()
+        _current.reset(token)
+        _exporter.export(record)
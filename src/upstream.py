@@ -0,0 +1,97 @@
+"""Shared async HTTP client for calls to the Experian API.
+
+A single keep-alive, connection-pooled ``httpx.AsyncClient`` is reused by the
+token fetch and every ``credit_score`` call so that concurrent tool calls never
+block the event loop and never pay a fresh TLS handshake.
+
+Pool limits and timeouts are read from the environment:
+
+    EXPERIAN_MAX_CONNECTIONS            total connections in the pool (default 100)
+    EXPERIAN_MAX_KEEPALIVE_CONNECTIONS  idle connections kept open (default 20)
+    EXPERIAN_KEEPALIVE_EXPIRY           seconds an idle connection is kept (default 30)
+    EXPERIAN_CONNECT_TIMEOUT            seconds to establish a connection (default 5)
+    EXPERIAN_READ_TIMEOUT               seconds to wait for response data (default 30)
+    EXPERIAN_POOL_TIMEOUT               seconds to wait for a free connection (default 10)
+"""
+
+import logging
+import os
+import time
+
+import httpx
+
+import metrics
+
+MAX_CONNECTIONS = int(os.getenv("EXPERIAN_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("EXPERIAN_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("EXPERIAN_KEEPALIVE_EXPIRY", "30"))
+CONNECT_TIMEOUT = float(os.getenv("EXPERIAN_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("EXPERIAN_READ_TIMEOUT", "30"))
+POOL_TIMEOUT = float(os.getenv("EXPERIAN_POOL_TIMEOUT", "10"))
+
+# httpx logs every request at INFO; keep the server log readable.
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+_client: httpx.AsyncClient | None = None
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Records latency, status codes and errors of upstream calls in ``metrics``.
+
+    Latency is measured until the response headers arrive, so streamed
+    bodies do not count toward it.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as e:
+            metrics.upstream_errors.inc(path, type(e).__name__)
+            raise
+        metrics.upstream_duration.observe(time.perf_counter() - start, path)
+        metrics.upstream_requests.inc(path, str(response.status_code))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared upstream client, creating it on first use.
+
+    The client is bound to the event loop it is first used on; call
+    ``aclose()`` before that loop exits so a later loop gets a fresh pool.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(
+            connect=CONNECT_TIMEOUT,
+            read=READ_TIMEOUT,
+            write=READ_TIMEOUT,
+            pool=POOL_TIMEOUT,
+        )
+        transport = InstrumentedTransport(httpx.AsyncHTTPTransport(limits=limits))
+        _client = httpx.AsyncClient(transport=transport, timeout=timeout)
+        logging.debug(
+            f"Created upstream client (max_connections={MAX_CONNECTIONS}, "
+            f"max_keepalive={MAX_KEEPALIVE_CONNECTIONS}, read_timeout={READ_TIMEOUT}s)"
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Close the shared client and release its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -2,6 +2,7 @@ import requests
 import json
 import os
 import logging
+import time
 import dotenv
 
 dotenv.load_dotenv(".env")
@@ -30,11 +31,43 @@ SUBSCRIBER_CODE = (
 
 CLIENT_REFERENCE_ID = os.getenv("EXPERIAN_CLIENT_REFERENCE_ID", "SBMYSQL")
 
-TOKEN_URL = "https://sandbox-us-api.experian.com/oauth2/v1/token"  # Sandbox URL
+BASE_URL = os.getenv("EXPERIAN_BASE_URL", "https://sandbox-us-api.experian.com").rstrip("/")
+TOKEN_URL = f"{BASE_URL}/oauth2/v1/token"  # Sandbox URL
+
+# Same cache file format as the MCP server's token manager, so both reuse one login.
+TOKEN_CACHE = os.getenv("EXPERIAN_TOKEN_CACHE", ".experian_token.json")
+
+
+def load_cached_token() -> str | None:
+    """Return a cached access token if it is still valid for at least a minute."""
+    try:
+        with open(TOKEN_CACHE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("expires_at", 0) - 60 > time.time():
+        return cached.get("access_token")
+    return None
+
+
+def save_cached_token(token_data: dict) -> None:
+    """Persist the token and its absolute expiry time for later runs."""
+    expires_at = time.time() + float(token_data.get("expires_in", 1800))
+    fd = os.open(TOKEN_CACHE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({"access_token": token_data.get("access_token"), "expires_at": expires_at}, f)
 
 
 def get_access_token() -> str | None:
-    """Obtain OAuth2 token using ROPC flow as required by Experian sandbox."""
+    """Obtain OAuth2 token using ROPC flow as required by Experian sandbox.
+
+    A token cached by a previous run is reused until shortly before it expires.
+    """
+    cached_token = load_cached_token()
+    if cached_token:
+        logging.info(f"Reusing cached access token from {TOKEN_CACHE}")
+        return cached_token
+
     headers = {
         "Accept": "application/json",
         "Content-Type": "application/x-www-form-urlencoded",
@@ -52,7 +85,9 @@ def get_access_token() -> str | None:
         resp = requests.post(TOKEN_URL, data=payload, headers=headers)
         logging.debug(f"Token response: {resp.status_code} {resp.text}")
         resp.raise_for_status()
-        return resp.json().get("access_token")
+        token_data = resp.json()
+        save_cached_token(token_data)
+        return token_data.get("access_token")
     except requests.exceptions.RequestException as e:
         logging.error(f"Error obtaining token: {e}")
         if hasattr(e, "response") and getattr(e, "response") is not None:
@@ -104,9 +139,7 @@ def main() -> None:
 
     logging.info("Obtained Experian access token.")
 
-    API_URL = (
-        "https://sandbox-us-api.experian.com/consumerservices/credit-profile/v2/credit-report"
-    )
+    API_URL = f"{BASE_URL}/consumerservices/credit-profile/v2/credit-report"
     body = build_credit_report_request()
 
     headers = {
@@ -0,0 +1,102 @@
+"""Benchmark the bytes and CPU time of each response compression mode.
+
+Encodes typical tools/call responses the way the server does (compact JSON
+in a JSON-RPC envelope), then compresses them with gzip and zstd at several
+levels. For each mode it reports the compressed size, the CPU time to
+compress and decompress one response, and the time to deliver it over links
+of a few speeds (compression + transfer + decompression), so the level and
+``EXPERIAN_COMPRESSION_MIN_SIZE`` can be chosen for where clients run.
+
+    uv run testing/bench_compression.py [--iterations N] [--mbps 10 100 1000]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_serialization import OUTPUT_JSON, summary_result
+from credit_profile import decode_report
+from report_parser import REPORT_SECTIONS
+from report_sections import select_sections
+from serialization import dumps, tool_result
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def response(result: dict) -> bytes:
+    """Serialize a tools/call response as the HTTP transport sends it."""
+    return b'{"jsonrpc":"2.0","id":1,"result":' + dumps(tool_result(result)) + b'}'
+
+
+def modes() -> list[tuple[str, object, object]]:
+    """Return (name, compress, decompress) for each mode measured."""
+    result = [("identity", lambda data: data, lambda data: data)]
+    for level in (1, 5, 9):
+        result.append((
+            f"gzip -{level}",
+            lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0),
+            gzip.decompress,
+        ))
+    if zstandard is not None:
+        decompressor = zstandard.ZstdDecompressor()
+        for level in (1, 3, 9, 19):
+            compressor = zstandard.ZstdCompressor(level=level)
+            result.append((f"zstd -{level}", compressor.compress, decompressor.decompress))
+    return result
+
+
+def cpu_us(fn, data: bytes, iterations: int) -> float:
+    """Return CPU microseconds per call of ``fn(data)``."""
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(data)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MCP response compression")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--mbps", type=float, nargs="+", default=[10, 100, 1000],
+                        help="link speeds in Mbit/s to estimate delivery time for")
+    args = parser.parse_args()
+
+    with open(OUTPUT_JSON, "rb") as f:
+        raw = f.read()
+    profile = json.loads(raw)["creditProfile"][0]
+
+    payloads = [
+        ("credit_score summary", response(summary_result(profile))),
+        ("credit_report_sections page", response(select_sections(decode_report(raw), REPORT_SECTIONS))),
+        ("full credit profile", response(profile)),
+    ]
+    if zstandard is None:
+        print("zstandard is not installed; only gzip is measured")
+
+    for label, body in payloads:
+        print(f"\n{label} ({len(body)} bytes)")
+        header = f"{'mode':<12}{'bytes':>9}{'ratio':>8}{'comp us':>10}{'decomp us':>11}"
+        header += "".join(f"{f'@{mbps:g}Mb/s ms':>15}" for mbps in args.mbps)
+        print(header)
+        for name, compress, decompress in modes():
+            compressed = compress(body)
+            assert decompress(compressed) == body
+            compress_us = cpu_us(compress, body, args.iterations)
+            decompress_us = cpu_us(decompress, compressed, args.iterations)
+            line = f"{name:<12}{len(compressed):>9}{len(body) / len(compressed):>8.1f}"
+            line += f"{compress_us:>10.0f}{decompress_us:>11.0f}"
+            for mbps in args.mbps:
+                transfer_us = len(compressed) * 8 / mbps
+                line += f"{(compress_us + transfer_us + decompress_us) / 1e3:>15.2f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
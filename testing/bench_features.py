@@ -0,0 +1,58 @@
+"""Benchmark credit_features throughput on batches of credit profiles.
+
+Times column extraction and vectorized feature computation separately for
+batches of copies of the profile in output.json, and reports profiles per
+second for the whole pipeline.
+
+    uv run testing/bench_features.py [--batch-sizes 1 100 1000 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from credit_profile import decode_report
+from features import ProfileColumns, compute_features, extract_features
+
+OUTPUT_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output.json")
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    """Return the fastest of ``repeat`` runs of ``fn`` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark credit feature extraction")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    args = parser.parse_args()
+
+    with open(OUTPUT_JSON, "rb") as f:
+        profile = decode_report(f.read())
+    print(
+        f"profile: {len(profile.tradeline)} tradelines, {len(profile.inquiry)} inquiries, "
+        f"{len(profile.publicRecord)} public records"
+    )
+    print(f"{'batch':>8}{'columns ms':>12}{'features ms':>13}{'total ms':>10}{'profiles/s':>12}")
+    for size in args.batch_sizes:
+        profiles = [profile] * size
+        columns = ProfileColumns(profiles)
+        columns_s = best_of(lambda: ProfileColumns(profiles))
+        features_s = best_of(lambda: compute_features(columns))
+        total_s = best_of(lambda: extract_features(profiles))
+        print(
+            f"{size:>8}{columns_s * 1e3:>12.2f}{features_s * 1e3:>13.2f}"
+            f"{total_s * 1e3:>10.2f}{size / total_s:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark decode time and memory of the credit report section extraction.
+
+Compares the ways of getting the sections the tools serve out of a credit
+report, on output.json and on copies whose publicRecord and tradeline arrays
+are scaled up to simulate larger reports:
+
+    json       buffer the body, ``json.loads`` it and keep the sections as dicts
+    streaming  ``ProfileParser(stream=True)``: ijson events, sections built as they arrive
+    typed      one-pass msgspec decode of the buffered body into ``CreditProfile``
+    default    ``ProfileParser()``: typed up to ``EXPERIAN_STREAM_PARSE_BYTES``, streaming above
+
+For each it reports the time per decode, the peak memory allocated while
+decoding, including the received chunks a mode holds on to, and the memory
+the decoded sections keep alive, which is what every cached profile costs.
+
+    uv run testing/bench_report_parser.py [--iterations N]
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import report_parser
+from credit_profile import to_builtins
+from report_parser import ProfileParser, REPORT_SECTIONS
+
+OUTPUT_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output.json")
+CHUNK_SIZE = 16384
+
+
+def scaled_report(report: dict, factor: int) -> bytes:
+    """Return the report with its big arrays repeated ``factor`` times, as pretty-printed JSON."""
+    profile = dict(report["creditProfile"][0])
+    for section in ("publicRecord", "tradeline"):
+        profile[section] = profile[section] * factor
+    return json.dumps({"creditProfile": [profile]}, indent=4).encode()
+
+
+def chunks(raw: bytes) -> list[bytes]:
+    return [raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE)]
+
+
+def received(body: list[bytes]):
+    """Yield copies of the chunks, as a response hands out newly read buffers."""
+    for chunk in body:
+        yield memoryview(chunk).tobytes()
+
+
+def buffered_json(body: list[bytes]) -> dict:
+    # Same as response.json() on a fully read body
+    profile = json.loads(b"".join(list(received(body))))["creditProfile"][0]
+    return {key: profile[key] for key in REPORT_SECTIONS if key in profile}
+
+
+def parse_with(**options):
+    def parse(body: list[bytes]):
+        parser = ProfileParser(REPORT_SECTIONS, **options)
+        for chunk in received(body):
+            if parser.feed(chunk):
+                break
+        return parser.close()
+    return parse
+
+
+def measure(parse, body: list[bytes], iterations: int) -> tuple[float, int, int]:
+    """Return (milliseconds per decode, peak bytes allocated during one decode, bytes retained by the result)."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(body)
+    elapsed = (time.perf_counter() - start) / iterations * 1e3
+
+    gc.collect()
+    tracemalloc.start()
+    result = parse(body)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark credit report decoding")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(OUTPUT_JSON) as f:
+        report = json.load(f)
+
+    modes = [("json", buffered_json), ("typed", parse_with(stream_above=math.inf)), ("default", parse_with())]
+    if report_parser.ijson is not None:
+        print(f"ijson backend: {report_parser.ijson.backend}")
+        modes.insert(1, ("streaming", parse_with(stream=True)))
+    else:
+        print("ijson is not installed; streaming is not measured")
+    print(f"default streams reports above {report_parser.STREAM_PARSE_BYTES // 1024}KB")
+
+    print(f"{'report':>8}  {'mode':<10}{'ms':>8}{'peak KB':>10}{'retained KB':>13}")
+    for factor in (1, 4, 16, 64):
+        raw = scaled_report(report, factor)
+        body = chunks(raw)
+        expected = buffered_json(body)
+        for name, parse in modes:
+            result = parse(body)
+            sections = result if isinstance(result, dict) else to_builtins(result)
+            assert sections == expected, name
+            ms, peak, retained = measure(parse, body, args.iterations)
+            print(f"{len(raw) // 1024:>6}KB  {name:<10}{ms:>8.2f}{peak // 1024:>10}{retained // 1024:>13}")
+
+
+if __name__ == "__main__":
+    main()
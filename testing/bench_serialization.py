@@ -0,0 +1,121 @@
+"""Benchmark bytes and CPU time per tools/call response for each serialization mode.
+
+Compares the original encoding (indented JSON text inside a second json.dumps
+of the JSON-RPC envelope) with the compact single-pass encoding used by the
+server, for a credit_score summary and for a full credit profile.
+
+    uv run testing/bench_serialization.py [--iterations N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import serialization
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+OUTPUT_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output.json")
+
+
+def summary_result(profile: dict) -> dict:
+    """Build a credit_score style summary from a credit profile."""
+    identity = profile["consumerIdentity"]
+    name = identity["name"][0]
+    risk_model = profile["riskModel"][0]
+    return {
+        "ssn": profile["ssn"][0]["number"],
+        "consumer_name": {
+            "first_name": name.get("firstName", ""),
+            "middle_name": name.get("middleName", ""),
+            "last_name": name.get("surname", "")
+        },
+        "date_of_birth": f"{identity['dob']['month']}/{identity['dob']['day']}/{identity['dob']['year']}",
+        "report_date": profile["headerRecord"][0]["y2kReportedDate"],
+        "credit_score_info": {
+            "score": int(risk_model["score"]),
+            "model_indicator": risk_model["modelIndicator"],
+            "evaluation": risk_model["evaluation"],
+            "score_factors": risk_model["scoreFactors"]
+        }
+    }
+
+
+def original(result: dict) -> bytes:
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]}
+    }).encode()
+
+
+def compact_with(dumps):
+    def encode(result: dict) -> bytes:
+        text = dumps(result).decode()
+        envelope = dumps({"content": [{"type": "text", "text": text}]})
+        return b'{"jsonrpc":"2.0","id":1,"result":' + envelope + b'}'
+    return encode
+
+
+def compact_structured_with(dumps):
+    def encode(result: dict) -> bytes:
+        text = dumps(result).decode()
+        envelope = dumps({"content": [{"type": "text", "text": text}], "structuredContent": result})
+        return b'{"jsonrpc":"2.0","id":1,"result":' + envelope + b'}'
+    return encode
+
+
+def stdlib_dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def measure(encode, result: dict, iterations: int) -> tuple[int, float]:
+    """Return (bytes per response, CPU microseconds per response)."""
+    payload = encode(result)
+    start = time.process_time()
+    for _ in range(iterations):
+        encode(result)
+    elapsed = time.process_time() - start
+    return len(payload), elapsed / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MCP response serialization")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(OUTPUT_JSON) as f:
+        profile = json.load(f)["creditProfile"][0]
+
+    modes = [
+        ("original (indent=2, double dumps)", original),
+        ("compact json", compact_with(stdlib_dumps)),
+        ("compact json + structuredContent", compact_structured_with(stdlib_dumps)),
+    ]
+    if orjson is not None:
+        modes += [
+            ("compact orjson", compact_with(orjson.dumps)),
+            ("compact orjson + structuredContent", compact_structured_with(orjson.dumps)),
+        ]
+    print(f"Server encoder: {serialization.JSON_ENCODER}")
+
+    for label, result, iterations in [
+        ("credit_score summary", summary_result(profile), args.iterations),
+        ("full credit profile", profile, max(1, args.iterations // 20)),
+    ]:
+        print(f"\n{label}")
+        print(f"{'mode':<38}{'bytes':>10}{'us/resp':>12}")
+        for name, encode in modes:
+            size, cpu_us = measure(encode, result, iterations)
+            print(f"{name:<38}{size:>10}{cpu_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""Load test the MCP server end to end against the mock Experian API.
+
+Starts ``testing/mock_experian.py`` on a free local port, points the server at
+it with ``EXPERIAN_BASE_URL`` and sends ``--requests`` tool calls with
+``--concurrency`` in flight over each selected transport:
+
+    asgi    ``create_app()`` in this process through ``httpx.ASGITransport``,
+            measuring request handling without sockets
+    http    ``src/server.py --transport streamable-http`` in a subprocess
+            (``--workers`` is passed through)
+    stdio   ``src/server.py`` in a subprocess over the MCP stdio transport
+
+For each transport it reports throughput, p50/p95/p99 latency, errors and the
+server's resident memory growth per request, and appends a record with the
+commit hash and settings to ``--output`` (JSON Lines). ``--compare`` prints
+the change against the latest record of another commit with the same
+settings and exits with status 1 when throughput or p95 latency regressed by
+more than ``--threshold``:
+
+    uv run testing/bench_server.py --transports asgi http stdio \\
+        --requests 2000 --concurrency 32 --upstream-latency lognormal:150,0.3 --compare
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+TESTING_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTING_DIR)
+SERVER = os.path.join(REPO_DIR, "src", "server.py")
+MOCK = os.path.join(TESTING_DIR, "mock_experian.py")
+DEFAULT_OUTPUT = os.path.join(TESTING_DIR, "bench_results.jsonl")
+
+# Fields of a result record that must match for two runs to be comparable
+CONFIG_KEYS = ("transport", "tool", "requests", "concurrency", "ssns", "workers", "upstream_latency", "cache_ttl")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return
+        time.sleep(0.05)
+    raise TimeoutError(f"Nothing listening on port {port} after {timeout}s")
+
+
+def process_rss(pid: int) -> int | None:
+    """Resident memory in bytes of ``pid`` and its descendants, or None if /proc is unavailable."""
+    try:
+        stats = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                with contextlib.suppress(OSError), open(f"/proc/{entry}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                    # fields[1] is the parent pid, fields[21] the RSS in pages
+                    stats[int(entry)] = (int(fields[1]), int(fields[21]))
+    except OSError:
+        return None
+    tree = {pid}
+    changed = True
+    while changed:
+        changed = False
+        for child, (parent, _) in stats.items():
+            if parent in tree and child not in tree:
+                tree.add(child)
+                changed = True
+    return sum(stats[p][1] for p in tree if p in stats) * os.sysconf("SC_PAGE_SIZE")
+
+
+def find_child(marker: str) -> int | None:
+    """Pid of a direct child of this process whose command line contains ``marker``."""
+    me = os.getpid()
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        with contextlib.suppress(OSError):
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read()
+            if parent == me and marker.encode() in cmdline:
+                return int(entry)
+    return None
+
+
+def git_commit() -> dict:
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=REPO_DIR, capture_output=True, text=True).stdout.strip()
+
+    return {"commit": git("rev-parse", "--short", "HEAD") or None, "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def tool_arguments(args, i: int) -> dict:
+    """Arguments of the ``i``-th call; SSNs cycle through ``args.ssns`` distinct values."""
+    ssn = f"{100000000 + i % args.ssns:09d}"
+    if args.tool == "credit_report_sections":
+        return {"ssn": ssn, "sections": ["tradeline"], "limit": 20}
+    return {"ssn": ssn}
+
+
+def call_failed(response: dict) -> bool:
+    if "error" in response:
+        return True
+    result = response.get("result") or {}
+    if result.get("isError"):
+        return True
+    content = result.get("content") or [{}]
+    return '"error"' in content[0].get("text", "")[:200]
+
+
+async def run_load(send, args) -> dict:
+    """Run ``args.requests`` calls of ``send(i)`` with ``args.concurrency`` in flight.
+
+    ``send`` returns True for a successful call. Returns throughput, latency
+    percentiles in milliseconds and the error count.
+    """
+    latencies = []
+    errors = 0
+    next_index = iter(range(args.requests))
+
+    async def worker():
+        nonlocal errors
+        for i in next_index:
+            start = time.perf_counter()
+            try:
+                ok = await send(i)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1e3, 3)
+
+    return {
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": round(latencies[-1] * 1e3, 3),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+async def measure(send, args, pid: int | None) -> dict:
+    """Warm up, then run the load and add the server's memory growth per request."""
+    for i in range(args.warmup):
+        await send(args.requests + i)
+    rss_before = process_rss(pid) if pid else None
+    result = await run_load(send, args)
+    rss_after = process_rss(pid) if pid else None
+    if rss_before is not None and rss_after is not None:
+        result["rss_mb"] = round(rss_after / 2**20, 1)
+        result["rss_growth_bytes_per_request"] = round((rss_after - rss_before) / args.requests)
+    return result
+
+
+def jsonrpc_call(i: int, args) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": i,
+        "method": "tools/call",
+        "params": {"name": args.tool, "arguments": tool_arguments(args, i)},
+    }
+
+
+async def bench_asgi(args) -> dict:
+    sys.path.insert(0, os.path.join(REPO_DIR, "src"))
+    import server
+    import upstream
+
+    logging.getLogger().setLevel(logging.WARNING)
+    app = server.create_app()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    async def send(i):
+        response = await client.post("/mcp", json=jsonrpc_call(i, args))
+        return response.status_code == 200 and not call_failed(response.json())
+
+    try:
+        return await measure(send, args, os.getpid())
+    finally:
+        await client.aclose()
+        await upstream.aclose()
+
+
+async def bench_http(args, env: dict) -> dict:
+    port = free_port()
+    command = [sys.executable, SERVER, "--transport", "streamable-http", "--port", str(port)]
+    if args.workers > 1:
+        command += ["--workers", str(args.workers)]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+
+            async def send(i):
+                response = await client.post("/mcp", json=jsonrpc_call(i, args))
+                return response.status_code == 200 and not call_failed(response.json())
+
+            return await measure(send, args, process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def bench_stdio(args, env: dict) -> dict:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(command=sys.executable, args=[SERVER], env=env)
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                async def send(i):
+                    result = await session.call_tool(args.tool, tool_arguments(args, i))
+                    text = result.content[0].text if result.content else ""
+                    return not result.isError and '"error"' not in text[:200]
+
+                return await measure(send, args, find_child(SERVER))
+
+
+def previous_record(path: str, record: dict) -> dict | None:
+    """Latest record in ``path`` from another commit with the same settings as ``record``."""
+    latest = None
+    with contextlib.suppress(OSError), open(path) as f:
+        for line in f:
+            with contextlib.suppress(ValueError):
+                other = json.loads(line)
+                if other.get("commit") != record["commit"] and all(other.get(k) == record[k] for k in CONFIG_KEYS):
+                    latest = other
+    return latest
+
+
+def compare(record: dict, baseline: dict, threshold: float) -> bool:
+    """Print the change against ``baseline``; return True if the run regressed."""
+    regressed = False
+    print(f"  vs {baseline['commit']} ({baseline['timestamp']}):")
+    for key, higher_is_better in (("throughput_rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False)):
+        old, new = baseline.get(key), record.get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        flag = ""
+        if key in ("throughput_rps", "p95_ms") and worse > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"    {key:<16}{old:>10}{new:>10}{change:>+9.1%}{flag}")
+    return regressed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the MCP server against the mock Experian API")
+    parser.add_argument("--transports", nargs="+", choices=["asgi", "http", "stdio"], default=["asgi", "http", "stdio"])
+    parser.add_argument("--tool", choices=["credit_score", "credit_report_sections", "credit_features"],
+                        default="credit_score")
+    parser.add_argument("--requests", type=int, default=1000, help="Calls per transport (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Calls in flight (default: 16)")
+    parser.add_argument("--ssns", type=int, default=None,
+                        help="Distinct SSNs to cycle through; fewer means more cache hits (default: one per call)")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed calls before each run (default: 20)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the http transport")
+    parser.add_argument("--upstream-latency", default="lognormal:150,0.3",
+                        help="Mock credit report latency spec (default: lognormal:150,0.3)")
+    parser.add_argument("--cache-ttl", type=int, default=300, help="EXPERIAN_CACHE_TTL for the server (default: 300)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON Lines file results are appended to")
+    parser.add_argument("--compare", action="store_true", help="Compare with the previous commit's results")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative throughput or p95 change counted as a regression (default: 0.1)")
+    args = parser.parse_args()
+    if args.requests < 1 or args.concurrency < 1:
+        parser.error("--requests and --concurrency must be at least 1")
+    if args.ssns is None:
+        args.ssns = args.requests + args.warmup
+    return args
+
+
+async def main() -> int:
+    args = parse_args()
+    mock_port = free_port()
+    mock = subprocess.Popen(
+        [sys.executable, MOCK, "--port", str(mock_port), "--report-latency", args.upstream_latency, "--seed", "1"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    env = dict(
+        os.environ,
+        EXPERIAN_BASE_URL=f"http://127.0.0.1:{mock_port}",
+        EXPERIAN_USERNAME="bench", EXPERIAN_PASSWORD="bench",
+        EXPERIAN_CLIENT_ID="bench", EXPERIAN_CLIENT_SECRET="bench",
+        EXPERIAN_CACHE_TTL=str(args.cache_ttl),
+        EXPERIAN_MAX_CONNECTIONS=str(max(100, args.concurrency)),
+    )
+    env.pop("EXPERIAN_CACHE_DB", None)
+    env.pop("EXPERIAN_TOKEN_CACHE", None)
+    env.pop("EXPERIAN_TRACE_EXPORT", None)
+    # The asgi transport imports the server into this process, which reads the same variables
+    os.environ.clear()
+    os.environ.update(env)
+
+    regressed = False
+    try:
+        wait_for_port(mock_port)
+        revision = git_commit()
+        print(f"commit {revision['commit']}{' (dirty)' if revision['dirty'] else ''}, "
+              f"{args.requests} x {args.tool}, concurrency {args.concurrency}, upstream {args.upstream_latency}")
+        for transport in args.transports:
+            if transport == "asgi":
+                result = await bench_asgi(args)
+            elif transport == "http":
+                result = await bench_http(args, env)
+            else:
+                result = await bench_stdio(args, env)
+            record = {
+                **revision,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "transport": transport,
+                "tool": args.tool,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "ssns": args.ssns,
+                "workers": args.workers if transport == "http" else 1,
+                "upstream_latency": args.upstream_latency,
+                "cache_ttl": args.cache_ttl,
+                **result,
+            }
+            memory = f", {record['rss_growth_bytes_per_request']} B/request" if "rss_mb" in record else ""
+            print(
+                f"{transport:<6}{record['throughput_rps']:>9} req/s  p50 {record['p50_ms']} ms  "
+                f"p95 {record['p95_ms']} ms  p99 {record['p99_ms']} ms  errors {record['errors']}{memory}"
+            )
+            if args.compare:
+                baseline = previous_record(args.output, record)
+                if baseline:
+                    regressed |= compare(record, baseline, args.threshold)
+                else:
+                    print("  no earlier commit with the same settings to compare with")
+            with open(args.output, "a") as f:
+                f.write(json.dumps(record) + "\n")
+    finally:
+        mock.terminate()
+        mock.wait(timeout=10)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
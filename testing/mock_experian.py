@@ -0,0 +1,268 @@
+"""Local stand-in for the Experian sandbox OAuth token and credit report endpoints.
+
+Serves ``POST /oauth2/v1/token`` and
+``POST /consumerservices/credit-profile/v2/credit-report`` on localhost so the
+MCP server and the scripts in ``testing/`` can be load tested and benchmarked
+without credentials or network access. Credit report requests are answered
+with the bytes of ``output.json`` (or ``--report``), after a simulated latency
+drawn from a configurable distribution. Errors, token expiry and rate limits
+can be injected:
+
+    uv run testing/mock_experian.py --port 8081 \\
+        --report-latency lognormal:250,0.4 --error-rate 0.01 --token-ttl 300 --rate-limit 50
+
+Point the server at it with ``EXPERIAN_BASE_URL=http://127.0.0.1:8081`` (any
+credentials are accepted). Latency specs, in milliseconds:
+
+    200                  fixed
+    uniform:100,300      uniform between the two bounds
+    normal:200,50        mean, standard deviation (clipped at 0)
+    lognormal:200,0.5    median, sigma of the underlying normal
+    exponential:200      mean
+
+``GET /_stats`` returns request counters as JSON and ``POST /_stats/reset``
+clears them, for benchmarks that check how many upstream calls were made.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import secrets
+import time
+from typing import Callable
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+OUTPUT_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output.json")
+
+TOKEN_PATH = "/oauth2/v1/token"
+CREDIT_REPORT_PATH = "/consumerservices/credit-profile/v2/credit-report"
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """Return a sampler of latencies in seconds for a latency spec in milliseconds.
+
+    Args:
+        spec (str): ``<ms>``, ``uniform:<low>,<high>``, ``normal:<mean>,<stddev>``,
+            ``lognormal:<median>,<sigma>`` or ``exponential:<mean>``.
+        rng (random.Random): Random source, seeded for reproducible runs.
+    Returns:
+        Callable[[], float]: Function returning one latency sample in seconds.
+    Raises:
+        ValueError: If the spec is malformed.
+    """
+    kind, _, args = spec.partition(":")
+    if not args:
+        fixed = float(kind) / 1e3
+        if fixed < 0:
+            raise ValueError(f"Latency must not be negative: {spec}")
+        return lambda: fixed
+    params = [float(value) for value in args.split(",")]
+    expected = {"uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+    if kind not in expected or len(params) != expected[kind]:
+        raise ValueError(f"Invalid latency spec {spec!r}; see --help for the supported forms")
+    if kind == "uniform":
+        low, high = params
+        return lambda: rng.uniform(low, high) / 1e3
+    if kind == "normal":
+        mean, stddev = params
+        return lambda: max(0.0, rng.gauss(mean, stddev)) / 1e3
+    if kind == "lognormal":
+        median, sigma = params
+        mu = math.log(median) if median > 0 else 0.0
+        return lambda: rng.lognormvariate(mu, sigma) / 1e3 if median > 0 else 0.0
+    mean = params[0]
+    return lambda: rng.expovariate(1 / mean) / 1e3 if mean > 0 else 0.0
+
+
+def error_body(status: int, error_type: str, message: str) -> dict:
+    """Build an error payload shaped like the Experian API's."""
+    return {"errors": [{"errorCode": str(status), "errorType": error_type, "message": message}]}
+
+
+class TokenBucket:
+    """Admits up to ``rate`` requests per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Consume one token; return 0 if admitted, else seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+def create_app(
+    report_path: str = OUTPUT_JSON,
+    token_latency: str = "0",
+    report_latency: str = "0",
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    unauthorized_rate: float = 0.0,
+    token_ttl: int = 1800,
+    rate_limit: float = 0.0,
+    burst: float | None = None,
+    seed: int | None = None,
+) -> Starlette:
+    """Create the mock Experian ASGI application.
+
+    Args:
+        report_path (str): JSON file returned as the credit report.
+        token_latency (str): Latency spec for token requests.
+        report_latency (str): Latency spec for credit report requests.
+        error_rate (float): Share of credit report requests answered with ``error_status``.
+        error_status (int): HTTP status of injected errors.
+        unauthorized_rate (float): Share of credit report requests whose token is
+            revoked and answered with 401, as if it had expired early.
+        token_ttl (int): ``expires_in`` of issued tokens; requests with an older
+            token get 401.
+        rate_limit (float): Credit report requests per second before answering
+            429 with ``Retry-After``; 0 disables rate limiting.
+        burst (float, optional): Token bucket size (default: one second of ``rate_limit``).
+        seed (int, optional): Seed for latency and error sampling.
+    Returns:
+        Starlette: The application, with request counters in ``app.state.stats``.
+    """
+    with open(report_path, "rb") as f:
+        report = f.read()
+    json.loads(report)  # fail at startup rather than on the first request
+
+    rng = random.Random(seed)
+    token_delay = parse_latency(token_latency, rng)
+    report_delay = parse_latency(report_latency, rng)
+    bucket = TokenBucket(rate_limit, burst or max(rate_limit, 1.0)) if rate_limit > 0 else None
+    issued: dict[str, float] = {}  # access token -> expiry time
+    stats = {"token": 0, "report": 0, "ok": 0, "unauthorized": 0, "rate_limited": 0, "errors": 0, "bad_requests": 0}
+
+    async def handle_token(request: Request) -> Response:
+        stats["token"] += 1
+        form = await request.form()
+        await asyncio.sleep(token_delay())
+        if form.get("grant_type") != "password" or not form.get("client_id"):
+            stats["bad_requests"] += 1
+            return JSONResponse(error_body(400, "invalid_request", "grant_type=password and client_id are required"), 400)
+        access_token = secrets.token_urlsafe(24)
+        issued[access_token] = time.time() + token_ttl
+        return JSONResponse({
+            "issued_at": str(int(time.time() * 1000)),
+            "expires_in": str(token_ttl),
+            "token_type": "Bearer",
+            "access_token": access_token,
+            "refresh_token": secrets.token_urlsafe(16),
+        })
+
+    async def handle_report(request: Request) -> Response:
+        stats["report"] += 1
+        if bucket is not None:
+            wait = bucket.take()
+            if wait:
+                stats["rate_limited"] += 1
+                return JSONResponse(
+                    error_body(429, "Too Many Requests", "Rate limit exceeded"), 429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+
+        scheme, _, access_token = request.headers.get("authorization", "").partition(" ")
+        expires_at = issued.get(access_token) if scheme.lower() == "bearer" else None
+        if expires_at is None or expires_at <= time.time() or rng.random() < unauthorized_rate:
+            issued.pop(access_token, None)
+            stats["unauthorized"] += 1
+            return JSONResponse(error_body(401, "Unauthorized", "Access token is invalid or has expired"), 401)
+
+        try:
+            body = json.loads(await request.body())
+            body["consumerPii"]["primaryApplicant"]["ssn"]["ssn"]
+        except (ValueError, KeyError, TypeError):
+            stats["bad_requests"] += 1
+            return JSONResponse(error_body(400, "Bad Request", "consumerPii.primaryApplicant.ssn is required"), 400)
+
+        await asyncio.sleep(report_delay())
+        if rng.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse(error_body(error_status, "Service Unavailable", "Injected error"), error_status)
+        stats["ok"] += 1
+        return Response(report, media_type="application/json")
+
+    async def handle_stats(request: Request) -> Response:
+        return JSONResponse(stats)
+
+    async def handle_stats_reset(request: Request) -> Response:
+        for key in stats:
+            stats[key] = 0
+        return JSONResponse(stats)
+
+    app = Starlette(routes=[
+        Route(TOKEN_PATH, endpoint=handle_token, methods=["POST"]),
+        Route(CREDIT_REPORT_PATH, endpoint=handle_report, methods=["POST"]),
+        Route("/_stats", endpoint=handle_stats, methods=["GET"]),
+        Route("/_stats/reset", endpoint=handle_stats_reset, methods=["POST"]),
+    ])
+    app.state.stats = stats
+    return app
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Mock Experian token and credit report endpoints",
+        epilog="Latency specs (ms): 200, uniform:100,300, normal:200,50, lognormal:200,0.5, exponential:200",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8081, help="Port to bind to (default: 8081)")
+    parser.add_argument("--report", default=OUTPUT_JSON, help="Credit report JSON to return (default: output.json)")
+    parser.add_argument("--token-latency", default="0", help="Token endpoint latency spec (default: 0)")
+    parser.add_argument("--report-latency", default="0", help="Credit report latency spec (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of reports answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected errors (default: 503)")
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0,
+                        help="Share of reports answered 401 with the token revoked")
+    parser.add_argument("--token-ttl", type=int, default=1800, help="Seconds issued tokens stay valid (default: 1800)")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Credit report requests per second before 429 (default: unlimited)")
+    parser.add_argument("--burst", type=float, default=None, help="Rate limit burst size (default: one second's worth)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for latency and error sampling")
+    args = parser.parse_args()
+    for name in ("error_rate", "unauthorized_rate"):
+        if not 0 <= getattr(args, name) <= 1:
+            parser.error(f"--{name.replace('_', '-')} must be between 0 and 1")
+    for name in ("token_latency", "report_latency"):
+        try:
+            parse_latency(getattr(args, name), random.Random())
+        except ValueError as e:
+            parser.error(f"--{name.replace('_', '-')}: {e}")
+    return args
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    app = create_app(
+        report_path=args.report,
+        token_latency=args.token_latency,
+        report_latency=args.report_latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        unauthorized_rate=args.unauthorized_rate,
+        token_ttl=args.token_ttl,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed,
+    )
+    logging.info(f"Mock Experian API on http://{args.host}:{args.port}; set EXPERIAN_BASE_URL to use it")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,132 @@
+"""Tests of the MCP server's HTTP transport against a stubbed Experian API.
+
+The server is imported into this process and driven through ``create_app()``
+with ``httpx.ASGITransport``; upstream calls are answered in process by an
+``httpx.MockTransport`` returning ``output.json``, so no network or mock
+server is needed:
+
+    uv run testing/test_server.py
+    uv run --with pytest pytest testing/test_server.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+TESTING_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TESTING_DIR, "..", "src"))
+os.environ.update(
+    EXPERIAN_BASE_URL="http://experian.test",
+    EXPERIAN_USERNAME="test", EXPERIAN_PASSWORD="test",
+    EXPERIAN_CLIENT_ID="test", EXPERIAN_CLIENT_SECRET="test",
+    EXPERIAN_CACHE_TTL="0",
+)
+for name in ("EXPERIAN_CACHE_DB", "EXPERIAN_TOKEN_CACHE", "EXPERIAN_TRACE_EXPORT"):
+    os.environ.pop(name, None)
+
+import server
+import upstream
+
+with open(os.path.join(TESTING_DIR, "..", "output.json"), "rb") as f:
+    REPORT = f.read()
+
+
+class StubExperian:
+    """Answers token and credit report requests, after ``report_latency`` seconds for reports.
+
+    The first ``rate_limited`` credit report requests get a 429 asking for a retry in one second.
+    """
+
+    def __init__(self, report_latency: float = 0.0, rate_limited: int = 0):
+        self.report_latency = report_latency
+        self.rate_limited = rate_limited
+        self.reports = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/token"):
+            return httpx.Response(200, json={"access_token": "test", "expires_in": "1800", "token_type": "Bearer"})
+        self.reports += 1
+        if self.reports <= self.rate_limited:
+            return httpx.Response(429, headers={"retry-after": "1"})
+        await asyncio.sleep(self.report_latency)
+        return httpx.Response(200, content=REPORT, headers={"content-type": "application/json"})
+
+
+async def post(client: httpx.AsyncClient, message) -> httpx.Response:
+    return await client.post("/mcp", json=message, headers={"accept": "application/json"})
+
+
+def run(test, experian: StubExperian | None = None) -> None:
+    """Run ``test(client)`` against a fresh app whose upstream calls go to ``experian``."""
+    async def main():
+        upstream._client = httpx.AsyncClient(transport=httpx.MockTransport(experian or StubExperian()))
+        try:
+            transport = httpx.ASGITransport(app=server.create_app())
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await test(client)
+        finally:
+            await upstream.aclose()
+    asyncio.run(main())
+
+
+def test_non_object_params_are_invalid():
+    async def test(client):
+        for params in ([1], "ssn", 3):
+            for method in ("tools/call", "prompts/get", "initialize"):
+                response = await post(client, {"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+                assert response.status_code == 200
+                assert response.json()["error"]["code"] == -32602, (method, params)
+            # A notification with bad params is dropped without a reply
+            response = await post(client, {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": params})
+            assert response.status_code == 202
+        # Omitted params are still accepted
+        response = await post(client, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        assert "tools" in response.json()["result"]
+    run(test)
+
+
+def test_shared_pull_outlives_the_deadline_of_the_call_that_started_it():
+    # The pull is only answered on a retry one second in
+    experian = StubExperian(rate_limited=1)
+
+    async def credit_score(client, request_id, timeout):
+        response = await post(client, {
+            "jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": "credit_score", "arguments": {"ssn": "123456789"}, "_meta": {"timeout": timeout}},
+        })
+        return response.json()
+
+    async def test(client):
+        first = asyncio.ensure_future(credit_score(client, 1, 0.5))
+        await asyncio.sleep(0.05)
+        second = await credit_score(client, 2, 5)
+        assert (await first)["error"]["code"] == server.REQUEST_TIMEOUT_ERROR
+        result = json.loads(second["result"]["content"][0]["text"])
+        assert "error" not in result, result
+        # The later call joined the pull the first one started
+        assert experian.reports == 2
+    run(test, experian)
+
+
+def test_credit_features_returns_the_ssn_as_credit_score_does():
+    async def test(client):
+        results = {}
+        for tool in ("credit_score", "credit_features"):
+            response = await post(client, {
+                "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                "params": {"name": tool, "arguments": {"ssn": "123-45-6789"}},
+            })
+            results[tool] = json.loads(response.json()["result"]["content"][0]["text"])
+        assert results["credit_features"]["ssn"] == results["credit_score"]["ssn"] != "123-45-6789"
+        assert "open_balance" in results["credit_features"]["features"]
+    run(test)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name} passed")
@@ -2,14 +2,16 @@ import streamlit as st
 import asyncio
 from mcp.client.streamable_http import streamablehttp_client
 from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.shared.session import RequestResponder
 import mcp.types as types
 import json
 
 class LoggingCollector:
     def __init__(self):
-        self.log_messages: list[LoggingMessageNotificationParams] = []
+        self.log_messages: list[types.LoggingMessageNotificationParams] = []
 
-    async def __call__(self, params: LoggingMessageNotificationParams) -> None:
+    async def __call__(self, params: types.LoggingMessageNotificationParams) -> None:
         self.log_messages.append(params)
 
 logging_collector = LoggingCollector()
@@ -30,11 +32,21 @@ async def message_handler(
             else:
                 print("SERVER_REQUEST:", message)
 
-async def get_credit_score(name: str):
-    """Calls the credit_score tool on the MCP server."""
+async def get_credit_score(name: str, status=None, session_id: str | None = None):
+    """Calls the credit_score tool on the MCP server, writing its progress to ``status`` if given.
+
+    Reuses the MCP session ``session_id`` when given instead of initializing a
+    new one, and keeps the session open for the next call.
+    Returns:
+        tuple: The credit report and the id of the session used.
+    """
     print("Starting client...")
     # Connect to a streamable HTTP server
-    async with streamablehttp_client("http://localhost:8000/mcp") as (
+    async with streamablehttp_client(
+        "http://localhost:8000/mcp",
+        headers={"mcp-session-id": session_id} if session_id else None,
+        terminate_on_close=False,
+    ) as (
         read_stream,
         write_stream,
         session_callback,
@@ -47,21 +59,26 @@ async def get_credit_score(name: str):
             message_handler=message_handler,
         ) as session:
 
-            # not initialized, should be None
-            id = session_callback()
-            print("ID: ", id)
-
-            # Initialize the connection
-            await session.initialize()
-
-            id = session_callback()
-            print("ID: ", id)
-
-            print("Session initialized, ready to call tools.")
+            if session_id is None:
+                # Initialize the connection
+                await session.initialize()
+                session_id = session_callback()
+                print("Session initialized, ready to call tools.")
+            else:
+                print("Reusing session, ready to call tools.")
+            print("ID: ", session_id)
           
             # Call a tool
             results = []
-            tool_result = await session.call_tool("credit_score", {"ssn": "123-45-6789"})
+            async def show_progress(progress: float, total: float | None, message: str | None) -> None:
+                # The server streams these over SSE while the credit report is pulled
+                if status is not None and message:
+                    status.update(label=message)
+                    status.write(message)
+
+            tool_result = await session.call_tool(
+                "credit_score", {"ssn": "123-45-6789"}, progress_callback=show_progress
+            )
                     
             gen = None
             # If the tool_result is an async generator, print its items
@@ -78,7 +95,20 @@ async def get_credit_score(name: str):
             # log = logging_collector.log_messages[0]
             # print("Log message:", log)
             credit_report = json.loads(tool_result.content[0].text)
-            return credit_report
+            return credit_report, session_id
+
+async def get_credit_score_in_session(name: str, status=None):
+    """Calls get_credit_score in the session of earlier clicks, starting a new one if it has expired."""
+    session_id = st.session_state.get("mcp_session_id")
+    try:
+        credit_report, session_id = await get_credit_score(name, status, session_id)
+    except McpError as e:
+        # The SDK reports a session the server no longer knows (HTTP 404) with code 32600
+        if session_id is None or e.error.code != 32600:
+            raise
+        credit_report, session_id = await get_credit_score(name, status)
+    st.session_state["mcp_session_id"] = session_id
+    return credit_report
 
 st.title("Experian Credit Check - an MCP Client")
 
@@ -86,8 +116,9 @@ name = st.text_input("Enter the SSN:", value="123-45-6789")
 
 if st.button("Get Credit Report"):
     if name:
-        with st.spinner("Calling credit_score tool..."):
-            result = asyncio.run(get_credit_score(name))
-            st.write("Credit Report:", result)
+        with st.status("Calling credit_score tool...") as status:
+            result = asyncio.run(get_credit_score_in_session(name, status))
+            status.update(label="Credit report received", state="complete")
+        st.write("Credit Report:", result)
     else:
         st.warning("Please enter a name.")